@@ -0,0 +1,40 @@
+# tldw_tube/api/routers/export.py
+from datetime import datetime
+from typing import Optional
+from fastapi import APIRouter, Query, Request, HTTPException, status
+from fastapi.responses import StreamingResponse
+from core.utils import ADMIN_HEADER, is_admin
+from services.export_service import EXPORT_FORMATS, export_summaries
+
+router = APIRouter()
+
+MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+@router.get("/export/summaries")
+def export_summary_corpus(
+    request: Request,
+    format: str = Query("ndjson", pattern=f"^({'|'.join(EXPORT_FORMATS)})$"),
+    created_from: Optional[datetime] = None,
+    created_to: Optional[datetime] = None,
+    updated_from: Optional[datetime] = None,
+    updated_to: Optional[datetime] = None,
+    after: Optional[str] = Query(None, description="Resume after this video id (the last one received)"),
+    limit: Optional[int] = Query(None, ge=1),
+):
+    """Stream cached summaries with their video metadata, ordered by video id."""
+    if not is_admin(request.headers.get(ADMIN_HEADER)):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Admin token required")
+
+    chunks = export_summaries(
+        format,
+        created_from=created_from,
+        created_to=created_to,
+        updated_from=updated_from,
+        updated_to=updated_to,
+        after=after,
+        limit=limit,
+    )
+    # A sync iterator, so Starlette pulls it from the threadpool without blocking the event loop
+    return StreamingResponse(chunks, media_type=MEDIA_TYPES[format], headers={
+        "Content-Disposition": f'attachment; filename="summaries.{format}"',
+    })
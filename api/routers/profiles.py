@@ -0,0 +1,27 @@
+# tldw_tube/api/routers/profiles.py
+import os
+from fastapi import APIRouter, Request, HTTPException, status
+from fastapi.responses import FileResponse
+from core.profiling import PROFILE_ARTIFACTS, profile_dir
+from core.utils import ADMIN_HEADER, is_admin
+
+router = APIRouter()
+
+MEDIA_TYPES = {
+    "report.json": "application/json",
+    "cpu.prof": "application/octet-stream",  # pstats; open with snakeviz or python -m pstats
+    "wall.collapsed": "text/plain",  # Collapsed stacks for flamegraph.pl / speedscope
+}
+
+@router.get("/profiles/{profile_id}/{artifact}")
+async def download_profile(request: Request, profile_id: str, artifact: str):
+    """Download an artifact of a profiled /summarize request."""
+    if not is_admin(request.headers.get(ADMIN_HEADER)):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Admin token required")
+    if artifact not in PROFILE_ARTIFACTS or not profile_id.isalnum():
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Unknown profile artifact")
+
+    path = os.path.join(profile_dir(profile_id), artifact)
+    if not os.path.exists(path):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Profile not found")
+    return FileResponse(path, media_type=MEDIA_TYPES[artifact], filename=f"{profile_id}-{artifact}")
@@ -0,0 +1,20 @@
+# tldw_tube/api/routers/search.py
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from api.schemas import SearchResponse, ErrorResponse
+from services.search_service import SearchService
+
+router = APIRouter()
+
+@router.get("/search", response_model=SearchResponse, responses={400: {"model": ErrorResponse}})
+def search_videos(
+    q: str = Query(..., min_length=1, max_length=200, description="Search query (web search syntax)"),
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    search_service: SearchService = Depends(SearchService)
+):
+    """Search cached videos by title, summary and transcript, most relevant first."""
+    try:
+        return search_service.search(q, limit, cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
@@ -1,9 +1,11 @@
 # tldw_tube/api/routers/summaries.py
-from fastapi import APIRouter, Depends, Request, HTTPException
+from contextlib import nullcontext
+from fastapi import APIRouter, Depends, Request, Response, HTTPException
 from api.schemas import SummarizeRequest, SummarizeResponse, ErrorResponse
 from api.dependencies import rate_limit
 from services.youtube_service import YouTubeService
 from core.utils import validate_youtube_url
+from core.profiling import PROFILE_ID_HEADER, RequestProfiler
 from api.exceptions import *  # Custom Exceptions
 import logging
 import traceback
@@ -19,6 +21,7 @@ router = APIRouter()
 async def summarize_video(
     request: Request,
     summarize_request: SummarizeRequest,
+    response: Response,
     db: Session = Depends(get_db),  # Inject the database session
     youtube_service: YouTubeService = Depends(YouTubeService)  # Inject YouTubeService
 ):
@@ -27,16 +30,25 @@ async def summarize_video(
     if not validate_youtube_url(summarize_request.url):
         raise InvalidYouTubeURLException()
 
+    # Opt-in profiling for admins; see api/routers/profiles.py for downloading the artifacts
+    profiler = RequestProfiler.for_request(request.headers, summarize_request.url)
+    # Error responses carry the id too, since failing and slow requests are the ones worth inspecting
+    profile_headers = {PROFILE_ID_HEADER: profiler.profile_id} if profiler else {}
+
     try:
-        result = await youtube_service.summarize_video(summarize_request.url)
+        async with profiler or nullcontext():
+            result = await youtube_service.summarize_video(summarize_request.url, fields=summarize_request.fields)
+        response.headers.update(profile_headers)
         if result:
             return SummarizeResponse(**result)
         else:
             raise SummarizationException()  # Should not get here. Kept for safety
 
     except HTTPException as e:  # Catching http exceptions and re-raising lets us keep specific status codes
+        if profile_headers:
+            e.headers = {**(e.headers or {}), **profile_headers}
         raise e
     except Exception as e:
         logger.error(f"Error processing summarization request: {type(e).__name__} - {e}\n{traceback.format_exc()}")
         # Use a generic 500 error for unexpected exceptions.
-        raise HTTPException(status_code=500, detail=f"An unexpected error occurred: {type(e).__name__}")
+        raise HTTPException(status_code=500, detail=f"An unexpected error occurred: {type(e).__name__}", headers=profile_headers or None)
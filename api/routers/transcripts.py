@@ -0,0 +1,32 @@
+# tldw_tube/api/routers/transcripts.py
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from api.schemas import TranscriptResponse, ErrorResponse
+from api.exceptions import CaptionsUnavailableException
+from services.transcript_service import TranscriptService
+
+router = APIRouter()
+
+@router.get("/transcript/{video_id}", response_model=TranscriptResponse, responses={400: {"model": ErrorResponse}, 404: {"model": ErrorResponse}})
+def get_transcript(
+    video_id: str,
+    start: float = Query(0.0, ge=0, description="Range start in seconds"),
+    end: Optional[float] = Query(None, ge=0, description="Range end in seconds (default: end of video)"),
+    transcript_service: TranscriptService = Depends(TranscriptService)
+):
+    """Return what is said in a time range of an already summarized video."""
+    if end is not None and end <= start:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="end must be greater than start")
+
+    index = transcript_service.get_index(video_id)
+    if index is None:
+        raise CaptionsUnavailableException(video_id)
+
+    segments = index.segments(start, end if end is not None else float("inf"))
+    return TranscriptResponse(
+        video_id=video_id,
+        start=start,
+        end=end,
+        text=" ".join(segment["text"] for segment in segments),
+        segments=segments,
+    )
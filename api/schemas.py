@@ -1,9 +1,13 @@
 # tldw_tube/api/schemas.py
-from pydantic import BaseModel, HttpUrl
-from typing import Dict, Optional
+from pydantic import BaseModel, Field, HttpUrl
+from typing import Dict, List, Literal, Optional
+from models.summary import SUMMARY_FIELDS
+
+SummaryField = Literal[SUMMARY_FIELDS]
 
 class SummarizeRequest(BaseModel):
     url: str
+    fields: Optional[List[SummaryField]] = Field(None, min_length=1)  # Summary fields needed now; the rest are filled in later
 
 class ErrorResponse(BaseModel):
     success: bool = False
@@ -23,3 +27,25 @@ class SummarizeResponse(BaseModel):
     aspect_ratio: float
     webpage_url: str
     summary: Dict
+
+class TranscriptSegment(BaseModel):
+    start: float
+    end: float
+    text: str
+
+class TranscriptResponse(BaseModel):
+    video_id: str
+    start: float
+    end: Optional[float] = None
+    text: str
+    segments: List[TranscriptSegment]
+
+class SearchResult(BaseModel):
+    video_id: str
+    title: str
+    snippet: str
+    rank: float
+
+class SearchResponse(BaseModel):
+    results: List[SearchResult]
+    next_cursor: Optional[str] = None  # Pass back as `cursor` for the next page
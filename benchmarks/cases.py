@@ -0,0 +1,106 @@
+# tldw_tube/benchmarks/cases.py
+import asyncio
+import copy
+import os
+from typing import Any, Callable, List
+
+os.environ.setdefault("OPENAI_API_KEY", "benchmark")  # Settings require it; nothing is called
+
+import webvtt
+from api.dependencies import rate_limit
+from core.caption_processor import CaptionProcessor
+from core.video_extractor import VideoExtractor
+from models.summary import SummaryData
+from models.video import CompactVideoMetadata, VideoMetadata
+from benchmarks import fixtures
+
+
+class Benchmark:
+    """A named hot-path measurement.
+
+    `setup(batch)` builds everything a run needs outside the timed region and
+    `run(state)` performs `batch` operations; results are reported per operation.
+    """
+
+    def __init__(self, name: str, run: Callable[[Any], Any], setup: Callable[[int], Any], batch: int):
+        self.name = name
+        self.run = run
+        self.setup = setup
+        self.batch = batch
+
+
+BENCHMARKS: List[Benchmark] = []
+
+def add(name: str, run: Callable[[Any], Any], setup: Callable[[int], Any] = lambda batch: batch, batch: int = 1):
+    BENCHMARKS.append(Benchmark(name, run, setup, batch))
+
+
+processor = CaptionProcessor()
+extractor = VideoExtractor(cache=None)
+
+
+# --- Caption processing ---
+def _dedupe(batches):
+    for captions in batches:
+        for _ in processor.dedupe_yt_captions(captions):
+            pass
+
+def _parse(content):
+    return lambda batch: [processor.parse_captions("vtt", content) for _ in range(batch)]
+
+for size, content, batch in (
+    ("small", fixtures.small_captions(), 20),
+    ("large", fixtures.large_captions(), 1),
+    ("pathological", fixtures.pathological_captions(), 1),
+):
+    parsed = webvtt.from_string(content)
+    # dedupe mutates captions in place, so every operation gets its own copies
+    add(f"dedupe_yt_captions[{size}]", _dedupe,
+        setup=lambda batch, parsed=parsed: [[copy.copy(c) for c in parsed] for _ in range(batch)], batch=batch)
+    add(f"parse_captions[{size}]", _parse(content), batch=batch)
+
+
+# --- Video metadata ---
+WATCH_PAGE = fixtures.watch_page()
+add("_parse_video_info[watch_page]",
+    lambda batch: [extractor._parse_video_info(WATCH_PAGE, fixtures.FIXTURE_VIDEO_ID) for _ in range(batch)], batch=5)
+
+for label, info in (("fixture", fixtures.video_info_full()), ("many_languages", fixtures.video_info_many_languages())):
+    metadata = VideoMetadata(**info)
+    add(f"get_captions_by_priority[{label}]",
+        lambda batch, metadata=metadata: [extractor.get_captions_by_priority(metadata) for _ in range(batch)], batch=1000)
+    add(f"validate_cached[video_full:{label}]",
+        lambda batch, info=info: [VideoMetadata(**info) for _ in range(batch)], batch=200)
+
+
+# --- Cached payload validation ---
+COMPACT = extractor._compact(VideoMetadata(**fixtures.video_info_full())).to_dict()
+SUMMARY = fixtures.summary()
+add("validate_cached[video_compact]", lambda batch: [CompactVideoMetadata.from_dict(COMPACT) for _ in range(batch)], batch=2000)
+add("validate_cached[summary]", lambda batch: [SummaryData(**SUMMARY) for _ in range(batch)], batch=2000)
+
+
+# --- Rate limiting ---
+class _Client:
+    def __init__(self, host: str):
+        self.host = host
+
+class _Request:
+    def __init__(self, host: str):
+        self.client = _Client(host)
+
+async def _drive(endpoint, requests):
+    for request in requests:
+        await endpoint(request)
+
+def _rate_limit_setup(batch):
+    @rate_limit(limit=10 ** 9, period=3600)
+    async def endpoint(request):
+        return None
+
+    requests = [_Request(f"10.{i // 65536 % 256}.{i // 256 % 256}.{i % 256}") for i in range(batch)]
+    # Give every IP some history so the per-call cleanup has work to do
+    asyncio.run(_drive(endpoint, requests * 3))
+    return endpoint, requests
+
+add("rate_limit[10k_ips]", lambda state: asyncio.run(_drive(*state)), setup=_rate_limit_setup, batch=10000)
@@ -0,0 +1,116 @@
+# tldw_tube/benchmarks/fixtures.py
+import json
+import os
+from typing import Dict, List, Tuple
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "cache")
+FIXTURE_VIDEO_ID = "ZxCY6RF_ZB0"
+
+
+def _load(name: str):
+    with open(os.path.join(FIXTURES_DIR, name)) as f:
+        return json.load(f)
+
+
+def _timestamp(total_seconds: float) -> str:
+    hours = int(total_seconds // 3600)
+    minutes = int(total_seconds % 3600 // 60)
+    return f"{hours:02d}:{minutes:02d}:{total_seconds % 60:06.3f}"
+
+
+def _parse_cues(vtt: str) -> Tuple[str, List[Tuple[float, float, str]]]:
+    """Split a VTT document into its header and (start, end, body) cues."""
+    header, *blocks = vtt.split("\n\n")
+    cues = []
+    for block in blocks:
+        lines = block.split("\n")
+        if " --> " not in lines[0]:
+            continue
+        start, rest = lines[0].split(" --> ")
+        end, _, settings = rest.partition(" ")
+        to_seconds = lambda ts: sum(float(part) * 60 ** i for i, part in enumerate(reversed(ts.split(":"))))
+        cues.append((to_seconds(start), to_seconds(end), settings + "\n" + "\n".join(lines[1:])))
+    return header, cues
+
+
+def small_captions() -> str:
+    """The recorded auto-generated captions of a ~90 second video."""
+    return _load(f"captions_{FIXTURE_VIDEO_ID}.json")
+
+
+def large_captions(target_seconds: float = 5400) -> str:
+    """The recorded captions repeated back to back up to the 90 minute limit."""
+    header, cues = _parse_cues(small_captions())
+    span = cues[-1][1] + 0.5
+    blocks = [header]
+    offset = 0.0
+    while offset < target_seconds:
+        for start, end, body in cues:
+            settings, _, text = body.partition("\n")
+            blocks.append(f"{_timestamp(start + offset)} --> {_timestamp(end + offset)} {settings}\n{text}")
+        offset += span
+    return "\n\n".join(blocks) + "\n"
+
+
+def pathological_captions(cues: int = 20000) -> str:
+    """Many tiny, overlapping, single-word cues: the worst case for the dedupe merge rules."""
+    blocks = ["WEBVTT\nKind: captions\nLanguage: en"]
+    for i in range(cues):
+        start = i * 0.05
+        end = start + (0.01 if i % 3 else 0.2)  # Mix of zero-ish and overlapping durations
+        word = "word" if i % 2 else f"w{i % 7}"
+        blocks.append(f"{_timestamp(start)} --> {_timestamp(end)} align:start position:0%\n{word}\n{word} {word}")
+    return "\n\n".join(blocks) + "\n"
+
+
+def video_info_full() -> Dict:
+    return _load(f"video_info_{FIXTURE_VIDEO_ID}.json")
+
+
+def video_info_many_languages(languages: int = 150) -> Dict:
+    """Full metadata with a caption track per language, English ones last."""
+    info = video_info_full()
+    track = info["automatic_captions"]["en"][0]
+    info["subtitles"] = {f"x{i:03d}": [dict(track, ext=ext) for ext in ("srv3", "ttml", "vtt")] for i in range(languages)}
+    info["subtitles"]["en-GB"] = [dict(track, ext="vtt")]
+    info["automatic_captions"] = {f"x{i:03d}": [dict(track)] for i in range(languages)}
+    info["automatic_captions"]["en"] = [dict(track)]
+    return info
+
+
+def summary() -> Dict:
+    return _load(f"summaries_{FIXTURE_VIDEO_ID}.json")
+
+
+def player_response(info: Dict, video_id: str, base_url: str) -> Dict:
+    """A player response for cached video info, with an auto-generated English track served from base_url."""
+    return {
+        "playabilityStatus": {"status": "OK"},
+        "videoDetails": {
+            "videoId": video_id,
+            "title": info["title"],
+            "lengthSeconds": str(info["duration"]),
+            "shortDescription": info["description"],
+            "thumbnail": {"thumbnails": [{"url": info["thumbnail_url"]}]},
+        },
+        "microformat": {"playerMicroformatRenderer": {"description": {"simpleText": info["description"]}}},
+        "captions": {"playerCaptionsTracklistRenderer": {"captionTracks": [{
+            "baseUrl": f"{base_url}/api/timedtext?v={video_id}&lang=en&kind=asr",
+            "languageCode": "en",
+            "kind": "asr",
+            "name": {"simpleText": "English (auto-generated)"},
+        }]}},
+    }
+
+
+def synthesize_watch_page(player: Dict, padding_kb: int) -> str:
+    """Embed a player response in a watch page padded to `padding_kb`."""
+    # Real watch pages are around a megabyte; pad so the regex scan costs what it does in production
+    padding = "<!-- " + "x" * (padding_kb * 1024) + " -->" if padding_kb else ""
+    return f"<html><head>{padding}</head><body><script>var ytInitialPlayerResponse = {json.dumps(player)};</script></body></html>"
+
+
+def watch_page(padding_kb: int = 900) -> str:
+    """A synthesized watch page of realistic size with the player response embedded."""
+    player = player_response(video_info_full(), FIXTURE_VIDEO_ID, "https://www.youtube.com")
+    return synthesize_watch_page(player, padding_kb)
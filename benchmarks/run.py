@@ -0,0 +1,120 @@
+# tldw_tube/benchmarks/run.py
+"""Run the hot-path micro-benchmarks and compare them against a stored baseline.
+
+    python -m benchmarks.run --output bench.json
+    python -m benchmarks.run --save-baseline                 # record benchmarks/baseline.json
+    python -m benchmarks.run --threshold 0.25                # exit 1 on a >25% slowdown, 2 without a baseline
+    python -m benchmarks.run --no-compare                    # just measure
+
+Baselines are only comparable on the machine they were recorded on.
+"""
+import argparse
+import fnmatch
+import gc
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+from typing import Dict, List, Optional
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+
+
+def measure(bench, repeat: int) -> Dict:
+    """Time `repeat` runs of a benchmark, each over fresh setup state, reporting per-operation cost."""
+    bench.run(bench.setup(bench.batch))  # Warm-up
+    samples = []
+    for _ in range(repeat):
+        state = bench.setup(bench.batch)
+        gc.collect()
+        gc.disable()
+        try:
+            start = time.perf_counter()
+            bench.run(state)
+            elapsed = time.perf_counter() - start
+        finally:
+            gc.enable()
+        samples.append(elapsed / bench.batch)
+    return {
+        "median_us": round(statistics.median(samples) * 1e6, 3),
+        "min_us": round(min(samples) * 1e6, 3),
+        "stdev_us": round(statistics.stdev(samples) * 1e6, 3) if len(samples) > 1 else 0.0,
+        "repeat": repeat,
+        "batch": bench.batch,
+    }
+
+
+def compare(results: Dict[str, Dict], baseline: Dict[str, Dict], threshold: float) -> List[str]:
+    """Names of benchmarks whose median got slower than the baseline by more than `threshold`."""
+    regressions = []
+    for name, result in results.items():
+        previous = baseline.get(name)
+        if not previous:
+            continue
+        ratio = result["median_us"] / previous["median_us"]
+        result["baseline_median_us"] = previous["median_us"]
+        result["change"] = round(ratio - 1, 4)
+        if ratio > 1 + threshold:
+            regressions.append(name)
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Hot-path micro-benchmarks with regression tracking.")
+    parser.add_argument("--filter", default="*", help="Glob over benchmark names")
+    parser.add_argument("--repeat", type=int, default=7)
+    parser.add_argument("--output", help="Write results as JSON to this file (default: stdout)")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--threshold", type=float, default=0.2, help="Allowed slowdown before failing, e.g. 0.2 = 20%%")
+    parser.add_argument("--save-baseline", action="store_true", help="Overwrite the baseline with this run")
+    parser.add_argument("--no-compare", action="store_true", help="Measure only; do not require a baseline")
+    args = parser.parse_args(argv)
+
+    from benchmarks.cases import BENCHMARKS
+
+    results = {}
+    for bench in BENCHMARKS:
+        if not fnmatch.fnmatch(bench.name, args.filter):
+            continue
+        results[bench.name] = measure(bench, args.repeat)
+        print(f"{bench.name:<45} {results[bench.name]['median_us']:>14,.1f} us/op", file=sys.stderr)
+
+    regressions = []
+    compared = False
+    if args.save_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+        print(f"Saved baseline to {args.baseline}", file=sys.stderr)
+    elif os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.threshold)
+        compared = True
+
+    report = {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "threshold": args.threshold,
+        "compared": compared,
+        "regressions": regressions,
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    else:
+        print(json.dumps(report, indent=2))
+
+    for name in regressions:
+        result = results[name]
+        print(f"REGRESSION {name}: {result['baseline_median_us']:.1f} -> {result['median_us']:.1f} us/op ({result['change']:+.0%})", file=sys.stderr)
+    if not compared and not args.save_baseline and not args.no_compare:
+        # A gate that compared nothing must not pass
+        print(f"No baseline at {args.baseline}; record one with --save-baseline or pass --no-compare", file=sys.stderr)
+        return 2
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,7 +2,7 @@
 import re
 import webvtt
 import xml.etree.ElementTree as ET
-from typing import List
+from typing import List, Tuple
 import logging
 
 logger = logging.getLogger(__name__)
@@ -77,6 +77,10 @@ class CaptionProcessor:
 
     def parse_captions(self, ext: str, content: str) -> str:
         """Parse caption content with formatting, handling XML if needed."""
+        return self.parse_captions_with_cues(ext, content)[0]
+
+    def parse_captions_with_cues(self, ext: str, content: str) -> Tuple[str, List[Tuple[float, float, str]]]:
+        """Parse caption content into formatted text plus the deduped (start, end, text) cues."""
         if ext != "vtt":
             raise ValueError(f"Unsupported caption format: {ext}")
 
@@ -93,9 +97,10 @@ class CaptionProcessor:
             try:
                 root = ET.fromstring(content)
                 caption_text = ""
+                cues = []
                 for text_elem in root.findall(".//text"):
                     start = float(text_elem.get("start", 0))
-                    # dur = float(text_elem.get("dur", 0))  # Not currently using duration
+                    dur = float(text_elem.get("dur", 0))
                     text = text_elem.text or ""
                     # Decode HTML entities (e.g., &#39; -> ')
                     text = text.replace("&#39;", "'").replace("&amp;", "&").replace("&quot;", '"')
@@ -103,21 +108,23 @@ class CaptionProcessor:
                         # Simple timing-based formatting (could refine with start/dur)
                         caption_text += " "
                     caption_text += text.strip()
+                    cues.append((start, start + dur, text.strip()))
                 if not caption_text:
                     raise ValueError("No text found in XML captions")
-                return caption_text  # Return as plain text for now
+                return caption_text, cues  # Return as plain text for now
             except ET.ParseError as e:
                 logger.error(f"Failed to parse XML captions: {str(e)}. Raw content: {content[:200]}...")
                 raise ValueError("Invalid caption format: Malformed XML") from e
 
         result = ""
         captions = list(self.dedupe_yt_captions(captions))
+        cues = []
 
         for i, caption in enumerate(captions):
             current_text = caption.text.replace("\n", " ").strip()
+            current_start = self._timestamp_to_seconds(caption.start)
             if i > 0:
-                prev_end = self._timestamp_to_seconds(captions[i-1].end)
-                current_start = self._timestamp_to_seconds(caption.start)
+                prev_end = cues[-1][1]
                 time_diff = current_start - prev_end
                 if time_diff >= 2:
                     result += "\n\n"
@@ -126,5 +133,6 @@ class CaptionProcessor:
                 else:
                     result += " "
             result += current_text
+            cues.append((current_start, self._timestamp_to_seconds(caption.end), current_text))
 
-        return " ".join(re.split(" +", result))
+        return " ".join(re.split(" +", result)), cues
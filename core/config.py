@@ -1,14 +1,37 @@
 # tldw_tube/core/config.py
 from pydantic_settings import BaseSettings, SettingsConfigDict
-from typing import Optional
+from typing import List, Optional
 
 class Settings(BaseSettings):
     openai_api_key: str
+    openai_base_url: Optional[str] = None  # Point at an OpenAI-compatible stub for load testing
     proxy_url: Optional[str] = None
     cache_dir: str = './cache'  # Still used for temporary files
     log_level: str = 'INFO'
     rate_limit_count: int = 5
     rate_limit_period: int = 60
+    admin_token: Optional[str] = None  # Enables admin-only features (e.g. request profiling) when set
+
+    # Search settings
+    search_backend: str = "auto"  # "postgres" (tsvector + GIN), "memory" (in-process inverted index) or "auto"
+    search_language: str = "english"  # Postgres text search configuration
+
+    # Profiling settings
+    profile_sample_interval: float = 0.005  # Seconds between wall-clock stack samples
+    profile_max_count: int = 50  # Profiles kept on disk per cache_dir; older ones are deleted
+
+    # Proxy pool settings
+    proxy_urls: List[str] = []  # Extra proxies rotated alongside proxy_url
+    proxy_max_concurrency: int = 8  # In-flight requests allowed per proxy
+    proxy_eject_failures: int = 3  # Consecutive failures before a proxy is ejected
+    proxy_eject_seconds: float = 30.0  # Base ejection time, doubled on repeat ejections
+    proxy_hedge_enabled: bool = True
+    proxy_hedge_min_delay: float = 0.25  # Floor for the p95 hedging deadline, and the deadline until enough samples exist (seconds)
+
+    # Video extractor settings
+    extractor_backend: str = "html"  # "player" (player JSON endpoint) or "html" (watch page scrape)
+    youtube_base_url: str = "https://www.youtube.com"  # Point at a local fixture server for testing
+    innertube_client_version: str = "2.20250219.01.00"
 
     # Database settings
     db_user: str = "user"  # Default values - replace in .env
@@ -16,6 +39,25 @@ class Settings(BaseSettings):
     db_host: str = "localhost"
     db_port: int = 5432
     db_name: str = "tldw_tube_db"
+    db_echo: bool = False  # Log every SQL statement (debugging only)
+    database_url: Optional[str] = None  # Overrides the db_* components, e.g. a local sqlite file for tests
+    db_read_urls: List[str] = []  # Read replicas for cache lookups; empty sends reads to the primary
+
+    # Connection pool settings (per worker, per engine)
+    db_pool_size: int = 5
+    db_max_overflow: int = 5
+    db_pool_recycle: int = 1800  # Seconds before a pooled connection is replaced
+    db_pool_timeout: float = 10.0  # Seconds to wait for a free connection
+    db_read_pool_size: int = 5
+    db_read_max_overflow: int = 5
+    db_read_pool_recycle: int = 1800
+
+    # Startup warm-up settings
+    startup_db_connections: int = 2  # Connections opened per worker before serving
+    startup_warm_http: bool = True  # Open a keep-alive connection to YouTube before serving
+    startup_warm_http_timeout: float = 3.0  # Seconds allowed for the HTTP warm-up request
+    startup_preload_summaries: int = 0  # Most recent summaries kept in worker memory (0 disables)
+    http_pool_size: int = 100  # Shared aiohttp connector limit per worker
 
     model_config = SettingsConfigDict(env_file=".env", env_file_encoding='utf-8')
 
@@ -0,0 +1,192 @@
+# tldw_tube/core/profiling.py
+import cProfile
+import json
+import os
+import shutil
+import sys
+import threading
+import time
+import tracemalloc
+import uuid
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, List, Optional
+from core.config import settings
+from core.utils import ADMIN_HEADER, is_admin
+import logging
+
+logger = logging.getLogger(__name__)
+
+PROFILE_ID_HEADER = "X-Profile-Id"
+PROFILE_ARTIFACTS = ("report.json", "cpu.prof", "wall.collapsed")
+
+_active: ContextVar[Optional["RequestProfiler"]] = ContextVar("active_profiler", default=None)
+# cProfile, tracemalloc and the sampler are process-wide, so only one request is profiled at a time
+_profiling_lock = threading.Lock()
+
+
+def profile_dir(profile_id: str = "") -> str:
+    return os.path.join(settings.cache_dir, "profiles", profile_id)
+
+
+@contextmanager
+def stage(name: str):
+    """Attribute time and memory to a pipeline stage; a no-op unless this request is being profiled."""
+    profiler = _active.get()
+    if profiler is None:
+        yield
+        return
+    with profiler.stage(name):
+        yield
+
+
+class StackSampler(threading.Thread):
+    """Samples one thread's Python stack at a fixed interval into flamegraph collapsed-stack counts."""
+
+    def __init__(self, thread_id: int, interval: float):
+        super().__init__(daemon=True, name="profile-sampler")
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self._stop_event = threading.Event()
+
+    def run(self):
+        while not self._stop_event.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})")
+                frame = frame.f_back
+            if stack:
+                self.stacks[";".join(reversed(stack))] += 1
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+
+    def collapsed(self) -> str:
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+
+class RequestProfiler:
+    """Wall-clock samples, a CPU profile and per-stage memory/IO accounting for one request.
+
+    Other requests served concurrently by the same worker show up in the
+    samples and the CPU profile, so profile on a quiet worker when possible.
+    """
+
+    def __init__(self, label: str):
+        self.profile_id = uuid.uuid4().hex
+        self.label = label
+        self.stages: List[Dict] = []
+        self.cpu_profile = cProfile.Profile(time.process_time)
+        self.sampler = StackSampler(threading.get_ident(), settings.profile_sample_interval)
+        self._started_tracemalloc = False
+        self._token = None
+        self._peak = 0
+
+    @classmethod
+    def for_request(cls, headers, label: str) -> Optional["RequestProfiler"]:
+        """A profiler if the admin header is present and valid and no other profile is running."""
+        if not is_admin(headers.get(ADMIN_HEADER)):
+            return None
+        if not _profiling_lock.acquire(blocking=False):
+            logger.warning("Profile requested while another is running; serving unprofiled")
+            return None
+        return cls(label)
+
+    @contextmanager
+    def stage(self, name: str):
+        tracemalloc.reset_peak()
+        memory_before = tracemalloc.get_traced_memory()[0]
+        wall_start = time.perf_counter()
+        cpu_start = time.thread_time()
+        try:
+            yield
+        finally:
+            wall = time.perf_counter() - wall_start
+            cpu = time.thread_time() - cpu_start
+            current, peak = tracemalloc.get_traced_memory()
+            self._peak = max(self._peak, peak)  # Stages reset the peak, so keep the overall one here
+            self.stages.append({
+                "stage": name,
+                "wall_ms": round(wall * 1000, 3),
+                "cpu_ms": round(cpu * 1000, 3),
+                "io_wait_ms": round(max(wall - cpu, 0) * 1000, 3),  # Time the event loop spent elsewhere or idle
+                "memory_peak_kb": round((peak - memory_before) / 1024, 1),
+                "memory_retained_kb": round((current - memory_before) / 1024, 1),
+            })
+
+    async def __aenter__(self) -> "RequestProfiler":
+        try:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                self._started_tracemalloc = True
+            self._token = _active.set(self)
+            self._wall_start = time.perf_counter()
+            self._cpu_start = time.thread_time()
+            self.sampler.start()
+            self.cpu_profile.enable()
+        except BaseException:
+            # __aexit__ will not run, and for_request already holds the lock
+            if self.sampler.is_alive():
+                self.sampler.stop()
+            if self._token is not None:
+                _active.reset(self._token)
+            if self._started_tracemalloc:
+                tracemalloc.stop()
+            _profiling_lock.release()
+            raise
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        try:
+            self.cpu_profile.disable()
+            self.sampler.stop()
+            wall = time.perf_counter() - self._wall_start
+            cpu = time.thread_time() - self._cpu_start
+            peak = max(self._peak, tracemalloc.get_traced_memory()[1])
+            if self._started_tracemalloc:
+                tracemalloc.stop()
+            _active.reset(self._token)
+            self._write(wall, cpu, peak, exc_type)
+        except Exception as e:
+            logger.error(f"Failed to write profile {self.profile_id}: {type(e).__name__} - {e}")
+        finally:
+            _profiling_lock.release()
+
+    def _write(self, wall: float, cpu: float, peak: int, exc_type):
+        directory = profile_dir(self.profile_id)
+        os.makedirs(directory, exist_ok=True)
+        self.cpu_profile.dump_stats(os.path.join(directory, "cpu.prof"))
+        with open(os.path.join(directory, "wall.collapsed"), "w") as f:
+            f.write(self.sampler.collapsed())
+        report = {
+            "profile_id": self.profile_id,
+            "label": self.label,
+            "pid": os.getpid(),
+            "error": exc_type.__name__ if exc_type else None,
+            "wall_ms": round(wall * 1000, 3),
+            "cpu_ms": round(cpu * 1000, 3),
+            "io_wait_ms": round(max(wall - cpu, 0) * 1000, 3),
+            "memory_peak_kb": round(peak / 1024, 1),
+            "samples": sum(self.sampler.stacks.values()),
+            "stages": self.stages,
+            "artifacts": list(PROFILE_ARTIFACTS),
+        }
+        with open(os.path.join(directory, "report.json"), "w") as f:
+            json.dump(report, f, indent=2)
+        logger.info(f"Wrote profile {self.profile_id} for {self.label} ({report['wall_ms']}ms)")
+        prune_profiles(settings.profile_max_count)
+
+
+def prune_profiles(keep: int) -> int:
+    """Delete all but the `keep` most recent profiles; returns how many were removed."""
+    root = profile_dir()
+    entries = [entry for entry in os.scandir(root) if entry.is_dir()]
+    entries.sort(key=lambda entry: entry.stat().st_mtime, reverse=True)
+    for entry in entries[keep:]:
+        shutil.rmtree(entry.path, ignore_errors=True)
+    return max(len(entries) - keep, 0)
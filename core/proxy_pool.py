@@ -0,0 +1,184 @@
+# tldw_tube/core/proxy_pool.py
+import asyncio
+import random
+import time
+from collections import defaultdict, deque
+from typing import Deque, Dict, Iterable, List, Optional
+import aiohttp
+from core.config import settings
+import logging
+
+logger = logging.getLogger(__name__)
+
+# HTTP statuses that say something about the proxy rather than the resource
+PROXY_FAILURE_STATUSES = {403, 407, 429}
+
+
+class ProxyState:
+    """Health and load bookkeeping for a single proxy (None means a direct connection)."""
+
+    def __init__(self, url: Optional[str], max_concurrency: int):
+        self.url = url
+        self.semaphore = asyncio.Semaphore(max_concurrency)
+        self.max_concurrency = max_concurrency
+        self.in_flight = 0
+        self.latency = 1.0  # EWMA of successful request latency (seconds)
+        self.success_rate = 1.0  # EWMA of request outcomes
+        self.consecutive_failures = 0
+        self.ejections = 0
+        self.ejected_until = 0.0
+
+    def is_available(self, now: float) -> bool:
+        return now >= self.ejected_until
+
+    def weight(self) -> float:
+        """Selection weight: healthy, fast and idle proxies are preferred."""
+        free_slots = max(self.max_concurrency - self.in_flight, 0)
+        if not free_slots:
+            return 0.0
+        return (self.success_rate ** 2) / max(self.latency, 0.01) * (free_slots / self.max_concurrency)
+
+
+class ProxyPool:
+    """Weighted, health-scored proxy rotation with hedged requests."""
+
+    EWMA_ALPHA = 0.2
+
+    def __init__(
+        self,
+        proxies: Iterable[Optional[str]],
+        max_concurrency: int = settings.proxy_max_concurrency,
+        eject_failures: int = settings.proxy_eject_failures,
+        eject_seconds: float = settings.proxy_eject_seconds,
+        hedge_enabled: bool = settings.proxy_hedge_enabled,
+        hedge_min_delay: float = settings.proxy_hedge_min_delay,
+    ):
+        unique = list(dict.fromkeys(proxies)) or [None]
+        self.proxies: List[ProxyState] = [ProxyState(url, max_concurrency) for url in unique]
+        self.eject_failures = eject_failures
+        self.eject_seconds = eject_seconds
+        self.hedge_enabled = hedge_enabled
+        self.hedge_min_delay = hedge_min_delay
+        # Recent successful latencies per request class, all proxies; a 1 MB watch page and a
+        # small caption file should not share a deadline
+        self.latencies: Dict[str, Deque[float]] = defaultdict(lambda: deque(maxlen=200))
+
+    def select(self, exclude: Iterable[ProxyState] = ()) -> Optional[ProxyState]:
+        """Pick a proxy at random, weighted by health, latency and free capacity."""
+        now = time.monotonic()
+        candidates = [p for p in self.proxies if p not in exclude]
+        if not candidates:
+            return None
+
+        available = [p for p in candidates if p.is_available(now)]
+        if not available:
+            # Everything is ejected: try the one closest to recovery rather than failing outright
+            return min(candidates, key=lambda p: p.ejected_until)
+
+        weights = [p.weight() for p in available]
+        if not any(weights):
+            # All proxies are at their concurrency cap; queue on the least loaded one
+            return min(available, key=lambda p: p.in_flight / p.max_concurrency)
+        return random.choices(available, weights=weights)[0]
+
+    def record(self, proxy: ProxyState, latency: float, ok: bool, request_class: str = "default"):
+        """Update a proxy's score after a request, ejecting it if it keeps failing."""
+        proxy.success_rate += self.EWMA_ALPHA * ((1.0 if ok else 0.0) - proxy.success_rate)
+        if ok:
+            proxy.latency += self.EWMA_ALPHA * (latency - proxy.latency)
+            proxy.consecutive_failures = 0
+            proxy.ejections = 0
+            self.latencies[request_class].append(latency)
+            return
+
+        proxy.consecutive_failures += 1
+        if proxy.consecutive_failures >= self.eject_failures:
+            proxy.ejections += 1
+            backoff = self.eject_seconds * 2 ** min(proxy.ejections - 1, 5)
+            proxy.ejected_until = time.monotonic() + backoff
+            proxy.consecutive_failures = 0
+            # Give it a fair chance once it comes back
+            proxy.success_rate = max(proxy.success_rate, 0.5)
+            logger.warning(f"Ejecting proxy {proxy.url or 'direct'} for {backoff:.0f}s")
+
+    def hedge_delay(self, request_class: str = "default") -> float:
+        """p95 of recent latency for this request class, used as the deadline before hedging."""
+        latencies = self.latencies.get(request_class)
+        if latencies is None or len(latencies) < 20:
+            return self.hedge_min_delay
+        ordered = sorted(latencies)
+        p95 = ordered[int(len(ordered) * 0.95) - 1]
+        return max(self.hedge_min_delay, p95)
+
+    async def _fetch_via(self, proxy: ProxyState, url: str, session: aiohttp.ClientSession, method: str, request_class: str, **kwargs) -> str:
+        async with proxy.semaphore:
+            proxy.in_flight += 1
+            start = time.monotonic()
+            try:
+                async with session.request(method, url, proxy=proxy.url, **kwargs) as response:
+                    response.raise_for_status()
+                    text = await response.text()
+            except asyncio.CancelledError:
+                # Lost a hedge race: not a failure, but it was at least this slow
+                elapsed = time.monotonic() - start
+                if elapsed > proxy.latency:
+                    proxy.latency += self.EWMA_ALPHA * (elapsed - proxy.latency)
+                raise
+            except aiohttp.ClientResponseError as e:
+                self.record(proxy, time.monotonic() - start, e.status not in PROXY_FAILURE_STATUSES and e.status < 500, request_class)
+                raise
+            except Exception:
+                self.record(proxy, time.monotonic() - start, False, request_class)
+                raise
+            finally:
+                proxy.in_flight -= 1
+            self.record(proxy, time.monotonic() - start, True, request_class)
+            return text
+
+    async def fetch(
+        self, url: str, session: aiohttp.ClientSession, method: str = "GET", *, request_class: str = "default", **kwargs
+    ) -> str:
+        """Fetch a URL through the pool, hedging through a second proxy past the request class's p95 deadline."""
+        primary = self.select()
+        first = asyncio.ensure_future(self._fetch_via(primary, url, session, method, request_class, **kwargs))
+        if not self.hedge_enabled or len(self.proxies) < 2:
+            return await first
+
+        try:
+            done, _ = await asyncio.wait({first}, timeout=self.hedge_delay(request_class))
+        except asyncio.CancelledError:
+            first.cancel()
+            raise
+        if done:
+            return first.result()
+
+        secondary = self.select(exclude=[primary])
+        if secondary is None:
+            return await first
+        logger.info(f"Hedging request to {url} via {secondary.url or 'direct'}")
+        second = asyncio.ensure_future(self._fetch_via(secondary, url, session, method, request_class, **kwargs))
+
+        pending = {first, second}
+        error: Optional[BaseException] = None
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        return task.result()
+                    error = task.exception()
+            raise error
+        finally:
+            for task in pending:
+                task.cancel()
+
+
+_pool: Optional[ProxyPool] = None
+
+def get_proxy_pool() -> ProxyPool:
+    """Process-wide proxy pool built from settings, so health scores survive across requests."""
+    global _pool
+    if _pool is None:
+        proxies = ([settings.proxy_url] if settings.proxy_url else []) + list(settings.proxy_urls)
+        _pool = ProxyPool(proxies)
+    return _pool
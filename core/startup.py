@@ -0,0 +1,119 @@
+# tldw_tube/core/startup.py
+import asyncio
+import os
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Optional
+import aiohttp
+from sqlalchemy import inspect, text
+from core.config import settings
+from core.proxy_pool import get_proxy_pool
+from database.database import engine, all_engines, SessionLocal, ReadSessionLocal
+from database import crud, models
+from services.cache_service import preload_summaries
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Bump whenever database/models.py changes so the next deploy re-runs create_all
+SCHEMA_VERSION = 3
+
+# Set by the gunicorn post_fork hook; falls back to import time outside gunicorn, where
+# warm_worker also bootstraps the schema since no master did
+FORKED_AT_ENV = "TLDW_WORKER_FORKED_AT"
+_imported_at = time.time()
+
+_http_session: Optional[aiohttp.ClientSession] = None
+
+
+def bootstrap_schema():
+    """Create or upgrade the schema once, skipping create_all when the version already matches."""
+    try:
+        if inspect(engine).has_table(models.SchemaVersion.__tablename__):
+            with SessionLocal() as db:
+                current = crud.get_schema_version(db)
+            if current == SCHEMA_VERSION:
+                logger.info(f"Database schema is at version {current}, skipping bootstrap")
+                return
+            logger.info(f"Database schema is at version {current}, upgrading to {SCHEMA_VERSION}")
+
+        models.Base.metadata.create_all(bind=engine)
+        with SessionLocal() as db:
+            crud.set_schema_version(db, SCHEMA_VERSION)
+        logger.info(f"Database schema bootstrapped at version {SCHEMA_VERSION}")
+    finally:
+        # Never hand pooled connections to forked workers
+        for e in all_engines():
+            e.dispose()
+
+
+def _warm_db():
+    """Open the worker's pool connections up front and optionally preload summaries."""
+    count = max(settings.startup_db_connections, 0)
+    connections = [e.connect() for e in all_engines() for _ in range(count)]
+    try:
+        for connection in connections:
+            connection.execute(text("SELECT 1"))
+    finally:
+        for connection in connections:
+            connection.close()  # Returned to the pool, still open
+
+    if settings.startup_preload_summaries > 0:
+        with ReadSessionLocal() as db:
+            preloaded = preload_summaries(db, settings.startup_preload_summaries)
+        logger.info(f"Preloaded {preloaded} summaries into memory")
+
+
+async def warm_worker():
+    """Pre-open database and HTTP connections so the first requests after a deploy are not cold."""
+    global _http_session
+    started = time.time()
+
+    if FORKED_AT_ENV not in os.environ:
+        # Not launched with gunicorn.conf.py (e.g. `uvicorn main:app`), so nothing has bootstrapped the schema
+        logger.warning("Not started through gunicorn.conf.py; bootstrapping the schema from this worker")
+        try:
+            bootstrap_schema()
+        except Exception as e:
+            logger.error(f"Schema bootstrap failed: {type(e).__name__} - {e}")
+
+    try:
+        _warm_db()
+    except Exception as e:
+        logger.error(f"Database warm-up failed: {type(e).__name__} - {e}")
+
+    _http_session = aiohttp.ClientSession(connector=aiohttp.TCPConnector(limit=settings.http_pool_size))
+    if settings.startup_warm_http:
+        try:
+            # Bounded: a blackholed upstream must not hold startup past gunicorn's worker timeout
+            timeout = settings.startup_warm_http_timeout
+            await asyncio.wait_for(
+                get_proxy_pool().fetch(
+                    settings.youtube_base_url, _http_session, "HEAD", request_class="warmup", timeout=aiohttp.ClientTimeout(total=timeout)
+                ),
+                timeout,
+            )
+        except Exception as e:
+            logger.warning(f"HTTP warm-up failed: {type(e).__name__} - {e}")
+
+    forked_at = float(os.environ.get(FORKED_AT_ENV, _imported_at))
+    now = time.time()
+    logger.info(f"Worker {os.getpid()} ready in {now - forked_at:.2f}s (warm-up {now - started:.2f}s)")
+
+
+async def shutdown_worker():
+    """Close the shared HTTP session."""
+    global _http_session
+    if _http_session is not None:
+        await _http_session.close()
+        _http_session = None
+
+
+@asynccontextmanager
+async def http_session() -> AsyncIterator[aiohttp.ClientSession]:
+    """Yield the worker's shared HTTP session, or a short-lived one if warm-up has not run."""
+    if _http_session is not None and not _http_session.closed:
+        yield _http_session
+    else:
+        async with aiohttp.ClientSession() as session:
+            yield session
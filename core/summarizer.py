@@ -1,117 +1,169 @@
 # tldw_tube/core/summarizer.py
+import asyncio
 import json
 import os
-from typing import Dict
+from typing import Dict, Iterable, List, Optional
 from openai import AsyncOpenAI
 from core.config import settings
-from models.summary import SummaryData
+from models.summary import SummaryData, SUMMARY_FIELDS
 from services.cache_service import CacheService  # Import CacheService
 from fastapi import Depends
 import logging
-from urllib.parse import quote_plus
+from urllib.parse import quote_plus, unquote_plus
 
 logger = logging.getLogger(__name__)
 
+# Each step continues the same conversation, so a field needs every step before it.
+# "word" is only final once the "wikipedia" step has appended the search term.
+SUMMARY_STEPS = SUMMARY_FIELDS
+STEP_DEPENDENCIES = {"word": "wikipedia"}
+
+# Background completions in flight in this worker, keyed by video id
+_background_tasks: Dict[str, asyncio.Task] = {}
+
 class Summarizer:
     def __init__(self, cache: CacheService = Depends(CacheService)):
-        self.client = AsyncOpenAI(api_key=settings.openai_api_key)
+        self.client = AsyncOpenAI(api_key=settings.openai_api_key, base_url=settings.openai_base_url)
         self.cache = cache  # Use injected CacheService
 
-    async def summarize_async(self, text: str, video_title: str, video_description: str, video_id: str) -> SummaryData:
-        """Generate summaries asynchronously using OpenAI."""
+    async def summarize_async(self, text: str, video_title: str, video_description: str, video_id: str, fields: Optional[Iterable[str]] = None) -> SummaryData:
+        """Generate summaries asynchronously using OpenAI.
 
+        Only the steps needed for `fields` (all fields when None) run before
+        returning; the rest are filled in by a background task and merged into
+        the cache, so partial cache entries are reused by later requests.
+        """
         cache_key = f"summaries_{video_id}"
-
-        cached_summaries = self.cache.get(cache_key, cache_type="summary") # Use cache_type
-        if cached_summaries:
+        needed = self._steps_needed(fields)
+
+        summaries = self._load_cached(cache_key)
+        done = self._steps_done(summaries)
+        if done < needed:
+            # Merges land on the primary; a lagging replica or preloaded copy must not cost a recompute
+            summaries = self._load_cached(cache_key, primary=True)
+            done = self._steps_done(summaries)
+
+        task = _background_tasks.get(video_id)
+        if done < needed and task is not None:
+            # Another request is already computing the missing steps
+            merged = await asyncio.shield(task)
+            summaries = self._normalize(merged) if merged else self._load_cached(cache_key, primary=True)
+            done = self._steps_done(summaries)
+
+        if done >= needed:
             logger.info(f"Using cached summaries for: {video_id}")
-            # Convert potential HttpUrl to string
-            if "wikipedia" in cached_summaries and cached_summaries["wikipedia"] is not None:
-                cached_summaries["wikipedia"] = str(cached_summaries["wikipedia"])
-            return SummaryData(**cached_summaries)
+        else:
+            messages = self._replay_messages(text, video_title, video_description, summaries, done)
+            for step in SUMMARY_STEPS[done:needed]:
+                await self._run_step(step, messages, summaries, video_title, video_description)
+            self._merge_into_cache(cache_key, summaries)
+            done = needed
+
+        if done < len(SUMMARY_STEPS) and video_id not in _background_tasks:
+            task = asyncio.create_task(self._complete_in_background(text, video_title, video_description, video_id, dict(summaries), done))
+            _background_tasks[video_id] = task
+            task.add_done_callback(lambda _: _background_tasks.pop(video_id, None))
+
+        return SummaryData(**summaries)
+
+    def _steps_needed(self, fields: Optional[Iterable[str]]) -> int:
+        """Length of the step prefix required to produce the requested fields."""
+        if fields is None:
+            return len(SUMMARY_STEPS)
+        needed = 0
+        for field in fields:
+            step = STEP_DEPENDENCIES.get(field, field)
+            needed = max(needed, SUMMARY_STEPS.index(step) + 1)
+        return needed
+
+    def _steps_done(self, summaries: Dict) -> int:
+        """Length of the step prefix already present in a (possibly partial) summary."""
+        done = 0
+        for step in SUMMARY_STEPS:
+            if summaries.get(step) is None:
+                break
+            done += 1
+        return done
+
+    def _load_cached(self, cache_key: str, primary: bool = False) -> Dict:
+        return self._normalize(self.cache.get(cache_key, cache_type="summary", primary=primary)) # Use cache_type
+
+    def _normalize(self, cached_summaries: Optional[Dict]) -> Dict:
+        cached_summaries = dict(cached_summaries or {})
+        # Convert potential HttpUrl to string
+        if cached_summaries.get("wikipedia") is not None:
+            cached_summaries["wikipedia"] = str(cached_summaries["wikipedia"])
+        return cached_summaries
+
+    def _merge_into_cache(self, cache_key: str, summaries: Dict) -> Optional[Dict]:
+        """Merge computed fields into whatever is cached, never dropping fields another request added."""
+        fields = SummaryData(**summaries).model_dump(exclude_none=True)
+        # Convert HttpUrl to string BEFORE caching
+        if fields.get("wikipedia"):
+            fields["wikipedia"] = str(fields["wikipedia"])
+        return self.cache.merge_summary(cache_key, fields)
+
+    async def _complete_in_background(self, text: str, video_title: str, video_description: str, video_id: str, summaries: Dict, done: int) -> Optional[Dict]:
+        """Compute the remaining steps after the response has been sent, returning the merged summary."""
+        try:
+            messages = self._replay_messages(text, video_title, video_description, summaries, done)
+            for step in SUMMARY_STEPS[done:]:
+                await self._run_step(step, messages, summaries, video_title, video_description)
+            return self._merge_into_cache(f"summaries_{video_id}", summaries)
+        except Exception as e:
+            logger.error(f"Background summarization failed for {video_id}: {type(e).__name__} - {e}")
+            return None
+
+    def _prompt(self, step: str, video_title: str, video_description: str) -> str:
+        if step == "paragraph":
+            return f"Summarize this video given its subtitles into increasing levels of conciseness. Begin by summarizing it into a single paragraph.\nTitle: {video_title}\nDescription:\n`{video_description}`\n\nDo not describe or mention the video itself. Simply summarize the points it makes. Focus on the overall or underlying takeaway, cause, reason, or answer BEYOND what's already in the title and description, which is already shown to the user. PROVIDE NO OTHER OUTPUT OTHER THAN THE PARAGRAPH.\nSubtitles follow:"
+        if step == "sentence":
+            return "Now summarize it into a single sentence. Focus on the overall or underlying takeaway, cause, reason, or answer BEYOND what's already in the title and description, which is already shown to the user. Basically, provide a single sentence answer to the question the video poses. PROVIDE NO OTHER OUTPUT OTHER THAN THE SENTENCE."
+        if step == "question":
+            return f'Rephrase the video title into a single motivating question. Focus on the overall TOPIC or SUBJECT of the video. This could be just the video title verbatim, especially if it is already a question. Don\'t use information outside of the video title. For example, if the title is "This problem ...", the question would be "What problem ...?". As a reminder, here is the video title again: "{video_title}". PROVIDE NO OTHER OUTPUT OTHER THAN THE QUESTION.'
+        if step == "word":
+            return 'Answer the question we just asked with just a single phrase, ideally one or two words. Examples: "Is EVOLUTION REAL?" -> "Yes." "Have scientists achieved fusion?" -> "No." "It depends." "Will AI take over the world?" -> "Nobody knows." "Why NO ONE lives here" -> "Poor geography." "Inside Disney\'s $1 BILLION disaster" -> "No market need." "Scientists FEAR this one thing" -> "Climate change." "Why is there war in the middle east?" -> "It\'s complicated." "Have we unlocked the secret to QUANTUM COMPUTING?" -> "Not really." "A day from Hell" -> "1999 Moore tornado" ... -> "Mostly." ... -> "Usually." PROVIDE NO OTHER OUTPUT OTHER THAN THE WORD(S) OF THE ANSWER.'
+        if step == "wikipedia":
+            return 'Now suggest a search term for a Wikipedia search that replaces watching the video. Make the search SPECIFIC to the TOPIC of the video. For example: "The $6 Billion Transit Project with No Ridership" -> "FasTracks"; "Why NOBODY lives in this part of China" -> "Gobi Desert"; "This unknown professor REVOLUTIONIZED ..." -> "Joseph-Louis Lagrange"; "Every Computer Can Be Hacked!" -> "Zero-Day Vulnerability"; Provide the Wikipedia page name with no special punctuation:'
+        return (
+            "Now create a structured summary by dividing the content into major themes or sections. "
+            "For each theme, provide a clear heading (like a short title), sentiment, and a concise paragraph or two "
+            "that explains the key points under that theme. Only output these headings and paragraphs. "
+            "Do not repeat the entire transcript, and do not include any disclaimers or extra text."
+        )
 
-        summaries = {}
+    def _replay_messages(self, text: str, video_title: str, video_description: str, summaries: Dict, done: int) -> List[Dict]:
+        """Rebuild the conversation up to `done` steps from already computed fields."""
         messages = [
-            {"role": "user", "content": f"Summarize this video given its subtitles into increasing levels of conciseness. Begin by summarizing it into a single paragraph.\nTitle: {video_title}\nDescription:\n`{video_description}`\n\nDo not describe or mention the video itself. Simply summarize the points it makes. Focus on the overall or underlying takeaway, cause, reason, or answer BEYOND what's already in the title and description, which is already shown to the user. PROVIDE NO OTHER OUTPUT OTHER THAN THE PARAGRAPH.\nSubtitles follow:"},
+            {"role": "user", "content": self._prompt("paragraph", video_title, video_description)},
             {"role": "user", "content": text}
         ]
-
-        # Paragraph summary
-        completion = await self.client.chat.completions.create(
-            model="gpt-4o",
-            messages=messages,
-        )
-        summaries["paragraph"] = completion.choices[0].message.content.strip()
-        messages.append({"role": "assistant", "content": summaries["paragraph"]})
-        logger.info(f"Paragraph summary: {summaries['paragraph']}")
-
-        # Sentence summary
-        messages.append({"role": "user", "content": "Now summarize it into a single sentence. Focus on the overall or underlying takeaway, cause, reason, or answer BEYOND what's already in the title and description, which is already shown to the user. Basically, provide a single sentence answer to the question the video poses. PROVIDE NO OTHER OUTPUT OTHER THAN THE SENTENCE."})
+        for step in SUMMARY_STEPS[:done]:
+            if step != "paragraph":
+                messages.append({"role": "user", "content": self._prompt(step, video_title, video_description)})
+            if step == "word" and summaries.get("wikipedia"):
+                content = summaries["word"].rsplit(" (", 1)[0]  # Answer without the appended search term
+            elif step == "wikipedia":
+                content = unquote_plus(summaries["wikipedia"].split("search=", 1)[1])
+            else:
+                content = summaries[step]
+            messages.append({"role": "assistant", "content": content})
+        return messages
+
+    async def _run_step(self, step: str, messages: List[Dict], summaries: Dict, video_title: str, video_description: str):
+        """Run one step of the conversation and record its field."""
+        if step != "paragraph":  # The paragraph prompt opens the conversation
+            messages.append({"role": "user", "content": self._prompt(step, video_title, video_description)})
         completion = await self.client.chat.completions.create(
             model="gpt-4o",
             messages=messages,
         )
-        summaries["sentence"] = completion.choices[0].message.content.strip()
-        messages.append({"role": "assistant", "content": summaries["sentence"]})
-        logger.info(f"Sentence summary: {summaries['sentence']}")
-
-        # Question
-        messages.append({"role": "user", "content": f'Rephrase the video title into a single motivating question. Focus on the overall TOPIC or SUBJECT of the video. This could be just the video title verbatim, especially if it is already a question. Don\'t use information outside of the video title. For example, if the title is "This problem ...", the question would be "What problem ...?". As a reminder, here is the video title again: "{video_title}". PROVIDE NO OTHER OUTPUT OTHER THAN THE QUESTION.'})
-        completion = await self.client.chat.completions.create(
-            model="gpt-4o",
-            messages=messages,
-        )
-        summaries["question"] = completion.choices[0].message.content.strip()
-        messages.append({"role": "assistant", "content": summaries["question"]})
-        logger.info(f"Question: {summaries['question']}")
-
-        # Word answer
-        messages.append({"role": "user", "content": 'Answer the question we just asked with just a single phrase, ideally one or two words. Examples: "Is EVOLUTION REAL?" -> "Yes." "Have scientists achieved fusion?" -> "No." "It depends." "Will AI take over the world?" -> "Nobody knows." "Why NO ONE lives here" -> "Poor geography." "Inside Disney\'s $1 BILLION disaster" -> "No market need." "Scientists FEAR this one thing" -> "Climate change." "Why is there war in the middle east?" -> "It\'s complicated." "Have we unlocked the secret to QUANTUM COMPUTING?" -> "Not really." "A day from Hell" -> "1999 Moore tornado" ... -> "Mostly." ... -> "Usually." PROVIDE NO OTHER OUTPUT OTHER THAN THE WORD(S) OF THE ANSWER.'})
-        completion = await self.client.chat.completions.create(
-            model="gpt-4o",
-            messages=messages,
-        )
-        summaries["word"] = completion.choices[0].message.content.strip()
-        messages.append({"role": "assistant", "content": summaries["word"]})
-        logger.info(f"Word answer: {summaries['word']}")
-
-        # Wikipedia search term
-        messages.append({"role": "user", "content": 'Now suggest a search term for a Wikipedia search that replaces watching the video. Make the search SPECIFIC to the TOPIC of the video. For example: "The $6 Billion Transit Project with No Ridership" -> "FasTracks"; "Why NOBODY lives in this part of China" -> "Gobi Desert"; "This unknown professor REVOLUTIONIZED ..." -> "Joseph-Louis Lagrange"; "Every Computer Can Be Hacked!" -> "Zero-Day Vulnerability"; Provide the Wikipedia page name with no special punctuation:'})
-        completion = await self.client.chat.completions.create(
-            model="gpt-4o",
-            messages=messages,
-        )
-        wikipedia_term = completion.choices[0].message.content.strip()
-        summaries["word"] += f" ({wikipedia_term})"  # Keep combined answer
-        summaries["wikipedia"] = f"https://en.wikipedia.org/w/index.php?search={quote_plus(wikipedia_term)}"
-        messages.append({"role": "assistant", "content": wikipedia_term})
-        logger.info(f"Wikipedia term: {wikipedia_term}")
-
-        # Structured summary with themes
-        messages.append({
-            "role": "user",
-            "content": (
-                "Now create a structured summary by dividing the content into major themes or sections. "
-                "For each theme, provide a clear heading (like a short title), sentiment, and a concise paragraph or two "
-                "that explains the key points under that theme. Only output these headings and paragraphs. "
-                "Do not repeat the entire transcript, and do not include any disclaimers or extra text."
-            )
-        })
-        completion = await self.client.chat.completions.create(
-            model="gpt-4o",
-            messages=messages,
-        )
-        summaries["themes"] = completion.choices[0].message.content.strip()
-        messages.append({"role": "assistant", "content": summaries["themes"]})
-        logger.info(f"Themes: {summaries['themes']}")
-
-        summary_data = SummaryData(**summaries)
-
-        # Convert HttpUrl to string BEFORE caching
-        summary_data_dump = summary_data.model_dump()
-        if summary_data_dump.get("wikipedia"):
-            summary_data_dump["wikipedia"] = str(summary_data_dump["wikipedia"])
-
-        self.cache.set(cache_key, summary_data_dump, cache_type="summary")  # Use cache_type
-
-        return summary_data
+        content = completion.choices[0].message.content.strip()
+        messages.append({"role": "assistant", "content": content})
+
+        if step == "wikipedia":
+            summaries["word"] += f" ({content})"  # Keep combined answer
+            summaries["wikipedia"] = f"https://en.wikipedia.org/w/index.php?search={quote_plus(content)}"
+        else:
+            summaries[step] = content
+        logger.info(f"{step.capitalize()} summary: {content}")
@@ -0,0 +1,94 @@
+# tldw_tube/core/transcript.py
+import struct
+import sys
+from array import array
+from bisect import bisect_left, bisect_right
+from typing import Dict, Iterable, List, Tuple
+
+# Serialized layout (little-endian): header, starts (f64), ends (f64), text offsets (u32), UTF-8 text
+_MAGIC = b"TRX1"
+_HEADER = struct.Struct("<4sI")
+
+
+class TranscriptIndex:
+    """Deduped caption cues in parallel arrays, for O(log n) lookup by time.
+
+    Cue i spans starts[i]..ends[i] and its text is text[offsets[i]:offsets[i + 1]].
+    max_ends[i] is the largest end among cues 0..i, which keeps the range
+    search correct even when a cue ends after its successor starts.
+    """
+
+    __slots__ = ("starts", "ends", "offsets", "text", "max_ends")
+
+    def __init__(self, starts: array, ends: array, offsets: array, text: str):
+        self.starts = starts
+        self.ends = ends
+        self.offsets = offsets
+        self.text = text
+        self.max_ends = array("d")
+        running = float("-inf")
+        for end in ends:
+            running = max(running, end)
+            self.max_ends.append(running)
+
+    @classmethod
+    def from_cues(cls, cues: Iterable[Tuple[float, float, str]]) -> "TranscriptIndex":
+        starts, ends, offsets, parts = array("d"), array("d"), array("I", [0]), []
+        length = 0
+        for start, end, text in sorted(cues, key=lambda cue: cue[0]):
+            starts.append(start)
+            ends.append(end)
+            parts.append(text)
+            length += len(text)
+            offsets.append(length)
+        return cls(starts, ends, offsets, "".join(parts))
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def _range(self, start: float, end: float) -> range:
+        """Indices of the cues overlapping [start, end)."""
+        first = bisect_right(self.max_ends, start)
+        last = bisect_left(self.starts, end)
+        return range(first, max(first, last))
+
+    def segments(self, start: float, end: float) -> List[Dict]:
+        """Cues overlapping [start, end), in order."""
+        return [
+            {"start": self.starts[i], "end": self.ends[i], "text": self.text[self.offsets[i]:self.offsets[i + 1]]}
+            for i in self._range(start, end)
+            if self.ends[i] > start  # max_ends only bounds the scan; skip cues that ended earlier
+        ]
+
+    def to_bytes(self) -> bytes:
+        return b"".join((
+            _HEADER.pack(_MAGIC, len(self.starts)),
+            _little_endian(self.starts).tobytes(),
+            _little_endian(self.ends).tobytes(),
+            _little_endian(self.offsets).tobytes(),
+            self.text.encode("utf-8"),
+        ))
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "TranscriptIndex":
+        magic, count = _HEADER.unpack_from(data)
+        if magic != _MAGIC:
+            raise ValueError("Not a serialized transcript index")
+        position = _HEADER.size
+        arrays = []
+        for typecode, length in (("d", count), ("d", count), ("I", count + 1)):
+            values = array(typecode)
+            size = values.itemsize * length
+            values.frombytes(data[position:position + size])
+            arrays.append(_little_endian(values))
+            position += size
+        return cls(*arrays, data[position:].decode("utf-8"))
+
+
+def _little_endian(values: array) -> array:
+    """The array itself on little-endian hosts, a byte-swapped copy elsewhere (the swap is symmetric)."""
+    if sys.byteorder == "little":
+        return values
+    swapped = array(values.typecode, values)
+    swapped.byteswap()
+    return swapped
@@ -1,5 +1,11 @@
 # tldw_tube/core/utils.py
+import hmac
+from typing import Optional
 from urllib.parse import urlparse, parse_qs
+from core.config import settings
+
+# Header carrying the admin token for admin-only features (profiling, exports)
+ADMIN_HEADER = "X-Admin-Token"
 
 def validate_youtube_url(url: str) -> bool:
     """Validate if the URL is a YouTube video URL."""
@@ -11,3 +17,9 @@ def validate_youtube_url(url: str) -> bool:
     query = parse_qs(parsed.query)
     return "v" in query and bool(query["v"][0])
 
+def is_admin(token: Optional[str]) -> bool:
+    """Check a token against the configured admin token (admin features are off when it is unset)."""
+    if not settings.admin_token or token is None:
+        return False
+    # Compare bytes: compare_digest rejects non-ASCII str, and header values can be any latin-1 text
+    return hmac.compare_digest(token.encode("utf-8"), settings.admin_token.encode("utf-8"))
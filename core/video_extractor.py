@@ -3,10 +3,11 @@ import os
 import json
 import re
 import aiohttp
-from typing import Dict, Optional, List
+from typing import Dict, Optional, List, Tuple
 from urllib.parse import urlparse, parse_qs
 from core.config import settings
-from models.video import VideoMetadata, CaptionTrack
+from core.proxy_pool import ProxyPool, get_proxy_pool
+from models.video import VideoMetadata, CaptionTrack, CompactVideoMetadata
 from services.cache_service import CacheService  # Import CacheService
 from fastapi import Depends  # Import Depends
 import logging
@@ -15,44 +16,88 @@ logger = logging.getLogger(__name__)
 
 class VideoExtractor:
     def __init__(self, proxy: Optional[str] = None, cache: CacheService = Depends(CacheService)):
-        self.proxy = proxy or settings.proxy_url
+        self.proxy_pool = ProxyPool([proxy]) if proxy else get_proxy_pool()
         self.subtitle_priorities = ['en-US', 'en-CA', 'en']
         self.auto_caption_priorities = ['en-orig', 'en-US', 'en-CA', 'en']
         self.format_priorities = ['vtt', 'srt', 'ttml']
         self.cache = cache  # Use injected CacheService
 
-    async def fetch_url(self, url: str, session: aiohttp.ClientSession) -> str:
-        """Fetch content from a URL asynchronously."""
-        async with session.get(url, proxy=self.proxy) as response:
-            response.raise_for_status()
-            return await response.text()
+    async def fetch_url(self, url: str, session: aiohttp.ClientSession, method: str = "GET", request_class: str = "default", **kwargs) -> str:
+        """Fetch content from a URL asynchronously through the proxy pool."""
+        return await self.proxy_pool.fetch(url, session, method, request_class=request_class, **kwargs)
 
-    async def extract_video_info_async(self, url: str, session: aiohttp.ClientSession) -> Optional[VideoMetadata]:
-        """Extract video metadata asynchronously."""
+    async def _fetch_player_response(self, video_id: str, session: aiohttp.ClientSession) -> Dict:
+        """Fetch the player response JSON directly, skipping the multi-MB watch page."""
+        payload = {
+            "context": {"client": {"clientName": "WEB", "clientVersion": settings.innertube_client_version, "hl": "en"}},
+            "videoId": video_id,
+        }
+        body = await self.fetch_url(f"{settings.youtube_base_url}/youtubei/v1/player?prettyPrint=false", session, "POST", "player", json=payload)
+        try:
+            data = json.loads(body)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Failed to parse JSON: {str(e)}")
+
+        status = data.get("playabilityStatus", {}).get("status")
+        if status != "OK" or "videoDetails" not in data:
+            raise ValueError(f"Player response not usable (status: {status})")
+        return data
+
+    async def _fetch_metadata_dict(self, video_id: str, session: aiohttp.ClientSession) -> Dict:
+        """Fetch metadata with the configured backend, falling back to the watch page scrape."""
+        if settings.extractor_backend == "player":
+            try:
+                data = await self._fetch_player_response(video_id, session)
+                return self._parse_player_response(data, video_id)
+            except Exception as e:
+                logger.warning(f"Player endpoint failed for {video_id}, falling back to watch page: {type(e).__name__} - {e}")
+
+        html = await self.fetch_url(f"{settings.youtube_base_url}/watch?v={video_id}", session, request_class="watch")
+        return self._parse_video_info(html, video_id)
+
+    async def extract_video_info_async(self, url: str, session: aiohttp.ClientSession) -> Optional[CompactVideoMetadata]:
+        """Extract compact video metadata asynchronously."""
         video_id = self._extract_video_id(url)
         cache_key = f"video_info_{video_id}"
 
         cached_data = self.cache.get(cache_key, cache_type="video") # Use cache_type
         if cached_data is not None:
             logger.info(f"Using cached video info for: {video_id}")
-            return VideoMetadata(**cached_data)
+            if "subtitles" in cached_data:  # Row written before the compact format; rewrite it once
+                compact = self._compact(VideoMetadata(**cached_data))
+                self.cache.set(cache_key, compact.to_dict(), cache_type="video")
+                return compact
+            return CompactVideoMetadata.from_dict(cached_data)
 
         try:
-            html = await self.fetch_url(f"https://www.youtube.com/watch?v={video_id}", session)
-            metadata_dict = self._parse_video_info(html, video_id)
-            metadata = VideoMetadata(**metadata_dict)
-
-            # Convert HttpUrl to string BEFORE caching
-            metadata_dump = metadata.model_dump()
-            if metadata_dump.get("thumbnail_url"):
-                metadata_dump["thumbnail_url"] = str(metadata_dump["thumbnail_url"])
-
-            self.cache.set(cache_key, metadata_dump, cache_type="video")  # Use cache_type
-            return metadata
+            metadata = await self._fetch_metadata(video_id, session)
+            compact = self._compact(metadata)
+            self.cache.set(cache_key, compact.to_dict(), cache_type="video")
+            return compact
         except Exception as e:
             logger.error(f"Error extracting video info for {video_id}: {str(e)}")
             return None
 
+    async def _fetch_metadata(self, video_id: str, session: aiohttp.ClientSession) -> VideoMetadata:
+        """Fetch and validate the full metadata."""
+        return VideoMetadata(**await self._fetch_metadata_dict(video_id, session))
+
+    def _compact(self, metadata: VideoMetadata) -> CompactVideoMetadata:
+        """Reduce full metadata to the compact form, resolving the caption track up front."""
+        track = self.get_captions_by_priority(metadata)
+        return CompactVideoMetadata(
+            id=metadata.id,
+            title=metadata.title,
+            description=metadata.description,
+            duration=metadata.duration,
+            thumbnail_url=str(metadata.thumbnail_url) if metadata.thumbnail_url else None,
+            aspect_ratio=metadata.aspect_ratio,
+            webpage_url=metadata.webpage_url,
+            caption_url=track.url if track else None,
+            caption_ext=track.ext if track else None,
+            caption_name=track.name if track else None,
+        )
+
     def _extract_video_id(self, url: str) -> str:
         """Extract video ID from YouTube URL."""
         parsed = urlparse(url)
@@ -73,13 +118,18 @@ class VideoExtractor:
         except json.JSONDecodeError as e:
             raise ValueError(f"Failed to parse JSON: {str(e)}")
 
+        return self._parse_player_response(data, video_id)
+
+    def _parse_player_response(self, data: Dict, video_id: str) -> Dict:
+        """Build the metadata dict from a player response object."""
         video_details = data.get("videoDetails", {})
         captions = data.get("captions", {}).get("playerCaptionsTracklistRenderer", {}).get("captionTracks", [])
 
         metadata = {
             "id": video_id,
             "title": video_details.get("title", ""),
-            "description": data.get("microformat", {}).get("playerMicroformatRenderer", {}).get("description", {}).get("simpleText", ""),
+            "description": data.get("microformat", {}).get("playerMicroformatRenderer", {}).get("description", {}).get("simpleText", "")
+                or video_details.get("shortDescription", ""),
             "duration": int(video_details.get("lengthSeconds", 0)),
             "thumbnail_url": video_details.get("thumbnail", {}).get("thumbnails", [{}])[-1].get("url", ""),
             "aspect_ratio": 1.78,
@@ -143,14 +193,19 @@ class VideoExtractor:
 
     async def download_captions_async(self, video_id: str, caption_track: CaptionTrack, session: aiohttp.ClientSession) -> str:
         """Download captions asynchronously, forcing VTT format."""
+        content, _ = await self.fetch_captions_async(video_id, caption_track, session)
+        return content
+
+    async def fetch_captions_async(self, video_id: str, caption_track: CaptionTrack, session: aiohttp.ClientSession) -> Tuple[str, bool]:
+        """Like download_captions_async, also reporting whether the captions were just downloaded."""
         cache_key = f"captions_{video_id}"
 
         cached_captions = self.cache.get(cache_key, cache_type="caption")  # Use cache_type
         if cached_captions:
             logger.info(f"Using cached captions for: {video_id}")
-            return cached_captions
+            return cached_captions, False
 
         url = caption_track.url + "&fmt=vtt"
-        content = await self.fetch_url(url, session)
+        content = await self.fetch_url(url, session, request_class="captions")
         self.cache.set(cache_key, content, cache_type="caption")  # Use cache_type
-        return content
+        return content, True
@@ -1,4 +1,5 @@
 # tldw_tube/database/crud.py
+from sqlalchemy import func
 from sqlalchemy.orm import Session
 from database import models
 from models.video import VideoMetadata
@@ -46,6 +47,26 @@ def update_caption_cache(db:Session, video_id:str, data:str):
         db.refresh(db_item)
     return db_item
 
+# --- TranscriptCache ---
+def get_transcript_cache(db: Session, video_id: str) -> Optional[bytes]:
+    cached = db.query(models.TranscriptCache).filter(models.TranscriptCache.id == video_id).first()
+    return cached.data if cached else None
+
+def create_transcript_cache(db: Session, video_id: str, data: bytes):
+    db_item = models.TranscriptCache(id=video_id, data=data)
+    db.add(db_item)
+    db.commit()
+    db.refresh(db_item)
+    return db_item
+
+def update_transcript_cache(db: Session, video_id: str, data: bytes):
+    db_item = db.query(models.TranscriptCache).filter(models.TranscriptCache.id == video_id).first()
+    if db_item:
+        db_item.data = data
+        db.commit()
+        db.refresh(db_item)
+    return db_item
+
 # --- SummaryCache ---
 def get_summary_cache(db: Session, video_id: str) -> Optional[Dict]:
     cached = db.query(models.SummaryCache).filter(models.SummaryCache.id == video_id).first()
@@ -66,6 +87,37 @@ def update_summary_cache(db:Session, video_id: str, data: Dict):
         db.refresh(db_item)
     return db_item
 
+def merge_summary_cache(db: Session, video_id: str, fields: Dict) -> Dict:
+    """Merge fields into a summary row under a row lock, so concurrent writers never drop each other's fields."""
+    db_item = db.query(models.SummaryCache).filter(models.SummaryCache.id == video_id).with_for_update().first()
+    if db_item is None:
+        create_summary_cache(db, video_id, fields)
+        return fields
+    merged = {**(db_item.data or {}), **fields}
+    db_item.data = merged
+    db.commit()
+    return merged
+
+def get_recent_summary_caches(db: Session, limit: int) -> Dict[str, Dict]:
+    recency = func.coalesce(models.SummaryCache.updated_at, models.SummaryCache.created_at)
+    rows = db.query(models.SummaryCache).order_by(recency.desc()).limit(limit).all()
+    return {row.id: row.data for row in rows}
+
+# --- SchemaVersion ---
+def get_schema_version(db: Session) -> Optional[int]:
+    row = db.query(models.SchemaVersion).filter(models.SchemaVersion.id == 1).first()
+    return row.version if row else None
+
+def set_schema_version(db: Session, version: int):
+    db_item = db.query(models.SchemaVersion).filter(models.SchemaVersion.id == 1).first()
+    if db_item:
+        db_item.version = version
+    else:
+        db_item = models.SchemaVersion(id=1, version=version)
+        db.add(db_item)
+    db.commit()
+    return db_item
+
 # --- ApiKey (Example) ---
 def get_api_key(db: Session, key_name: str) -> Optional[str]:
     api_key_entry = db.query(models.ApiKey).filter(models.ApiKey.key_name == key_name, models.ApiKey.is_active == True).first()
@@ -1,18 +1,111 @@
 # tldw_tube/database/database.py
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, DeclarativeBase
+import itertools
+import threading
+import time
+from collections import deque
+from typing import Dict, List
+from sqlalchemy import create_engine, exc
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import QueuePool
+from sqlalchemy.orm import sessionmaker, DeclarativeBase, Session
 from core.config import settings
+from dotenv import load_dotenv
 
-load_dotenv()  
+load_dotenv()
 
-# Construct the database URL.  We'll get the components from our settings.
-DATABASE_URL = f"postgresql://{settings.db_user}:{settings.db_password}@{settings.db_host}:{settings.db_port}/{settings.db_name}"
+# Construct the database URL.  We'll get the components from our settings unless a full URL is given.
+DATABASE_URL = settings.database_url or f"postgresql://{settings.db_user}:{settings.db_password}@{settings.db_host}:{settings.db_port}/{settings.db_name}"
 
-# Create the database engine.  `echo=True` enables query logging (useful for debugging).
-engine = create_engine(DATABASE_URL, echo=True)
+class PoolStats:
+    """Checkout wait times and timeouts for one connection pool."""
 
-# Create a session factory.
+    def __init__(self, role: str):
+        self.role = role
+        self.checkouts = 0
+        self.timeouts = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self.recent_waits = deque(maxlen=1000)
+
+    def record_wait(self, wait: float):
+        self.checkouts += 1
+        self.total_wait += wait
+        self.max_wait = max(self.max_wait, wait)
+        self.recent_waits.append(wait)
+
+    def snapshot(self, pool: QueuePool) -> Dict:
+        capacity = pool.size() + max(pool._max_overflow, 0)
+        waits = sorted(self.recent_waits)
+        return {
+            "role": self.role,
+            "pool_size": pool.size(),
+            "max_overflow": pool._max_overflow,
+            "checked_out": pool.checkedout(),
+            "overflow": max(pool.overflow(), 0),
+            "saturation": round(pool.checkedout() / capacity, 3) if capacity else None,
+            "checkouts": self.checkouts,
+            "timeouts": self.timeouts,
+            "wait_avg_ms": round(self.total_wait / self.checkouts * 1000, 3) if self.checkouts else 0.0,
+            "wait_p95_ms": round(waits[int(len(waits) * 0.95) - 1] * 1000, 3) if len(waits) >= 20 else None,
+            "wait_max_ms": round(self.max_wait * 1000, 3),
+        }
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool that records how long each checkout waited for a connection."""
+
+    stats: PoolStats  # Set on a per-role subclass so it survives Pool.recreate()
+    _local = threading.local()
+
+    def _do_get(self):
+        if getattr(self._local, "active", False):
+            return super()._do_get()  # QueuePool retries recursively; time only the outer call
+        self._local.active = True
+        start = time.perf_counter()
+        try:
+            entry = super()._do_get()
+        except exc.TimeoutError:
+            self.stats.timeouts += 1
+            raise
+        finally:
+            self._local.active = False
+        self.stats.record_wait(time.perf_counter() - start)
+        return entry
+
+def _create_engine(url: str, role: str, pool_size: int, max_overflow: int, pool_recycle: int) -> Engine:
+    pool_class = type(f"{role.title()}QueuePool", (InstrumentedQueuePool,), {"stats": PoolStats(role)})
+    return create_engine(
+        url,
+        echo=settings.db_echo,
+        poolclass=pool_class,
+        pool_size=pool_size,
+        max_overflow=max_overflow,
+        pool_recycle=pool_recycle,
+        pool_timeout=settings.db_pool_timeout,
+        pool_pre_ping=True,
+    )
+
+# Create the database engines.  `db_echo` enables query logging (useful for debugging).
+# Writes always go to the primary; cache reads are spread over the replicas when configured.
+engine = _create_engine(DATABASE_URL, "primary", settings.db_pool_size, settings.db_max_overflow, settings.db_pool_recycle)
+read_engines: List[Engine] = [
+    _create_engine(url, f"replica{i}", settings.db_read_pool_size, settings.db_read_max_overflow, settings.db_read_pool_recycle)
+    for i, url in enumerate(settings.db_read_urls)
+] or [engine]
+
+# Create session factories.
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+_read_sessionmakers = itertools.cycle([sessionmaker(autocommit=False, autoflush=False, bind=e) for e in read_engines])
+
+def ReadSessionLocal() -> Session:
+    """Open a session on the next read replica (round-robin), or the primary if there are none."""
+    return next(_read_sessionmakers)()
+
+def all_engines() -> List[Engine]:
+    return [engine] + [e for e in read_engines if e is not engine]
+
+def pool_stats() -> List[Dict]:
+    """Pool occupancy and checkout wait telemetry for every engine in this worker."""
+    return [e.pool.stats.snapshot(e.pool) for e in all_engines()]
 
 # Base class for declarative models
 class Base(DeclarativeBase):
@@ -1,5 +1,6 @@
 # tldw_tube/database/models.py
-from sqlalchemy import Boolean, Column, Integer, String, Text, JSON, DateTime, Float
+from sqlalchemy import Boolean, Column, Integer, String, Text, JSON, DateTime, Float, LargeBinary, Index
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from sqlalchemy.sql import func
 from database.database import Base  # Import the Base class
 
@@ -27,6 +28,26 @@ class SummaryCache(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
+class TranscriptCache(Base):
+    __tablename__ = "transcript_cache"
+
+    id = Column(String, primary_key=True, index=True)  # video id
+    data = Column(LargeBinary)  # Serialized TranscriptIndex (see core/transcript.py)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+
+class SearchDocument(Base):  # Full-text search over cached videos, maintained on cache writes
+    __tablename__ = "search_documents"
+
+    id = Column(String, primary_key=True, index=True)  # video id
+    title = Column(Text, nullable=False, default="")
+    summary = Column(Text, nullable=False, default="")  # Summary fields joined together
+    transcript = Column(Text, nullable=False, default="")
+    document = Column(TSVECTOR().with_variant(Text(), "sqlite"))  # Weighted: title A, summary B, transcript C
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    __table_args__ = (Index("ix_search_documents_document", "document", postgresql_using="gin"),)
+
 class ApiKey(Base):  # Example for storing API keys
     __tablename__ = "api_keys"
 
@@ -37,3 +58,10 @@ class ApiKey(Base):  # Example for storing API keys
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     is_active = Column(Boolean, default=True)
 
+
+class SchemaVersion(Base):  # Single row recording the schema revision bootstrapped by the gunicorn master
+    __tablename__ = "schema_version"
+
+    id = Column(Integer, primary_key=True)
+    version = Column(Integer, nullable=False)
+    applied_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
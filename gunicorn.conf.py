@@ -0,0 +1,19 @@
+# tldw_tube/gunicorn.conf.py
+import os
+import time
+
+bind = os.environ.get("GUNICORN_BIND", "0.0.0.0:5001")
+workers = int(os.environ.get("GUNICORN_WORKERS", "4"))
+worker_class = "uvicorn.workers.UvicornWorker"
+
+
+def on_starting(server):
+    """Bootstrap the database schema once in the master, before any worker forks."""
+    from core.startup import bootstrap_schema
+    bootstrap_schema()
+
+
+def post_fork(server, worker):
+    """Record the fork time so each worker can report its time-to-ready."""
+    from core.startup import FORKED_AT_ENV
+    os.environ[FORKED_AT_ENV] = str(time.time())
@@ -0,0 +1,25 @@
+# tldw_tube/loadtest/common.py
+import asyncio
+import random
+from aiohttp import web
+
+
+def fault_middleware(latency_ms: float, jitter_ms: float, error_rate: float):
+    """Delay every response and fail a fraction of them with a 503, like a flaky upstream."""
+
+    @web.middleware
+    async def middleware(request: web.Request, handler):
+        delay = max(random.gauss(latency_ms, jitter_ms), 0) / 1000
+        if delay:
+            await asyncio.sleep(delay)
+        if error_rate and random.random() < error_rate:
+            return web.Response(status=503, text="Injected stub failure")
+        return await handler(request)
+
+    return middleware
+
+
+def add_fault_arguments(parser):
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Mean added latency per response")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="Standard deviation of the added latency")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of responses that fail with 503")
@@ -0,0 +1,147 @@
+# tldw_tube/loadtest/generator.py
+"""Open-loop load generator for /api/summarize with a configurable cache-hit ratio.
+
+    python -m loadtest.generator --target http://127.0.0.1:5001 --rps 20 --duration 60 --hit-ratio 0.8
+"""
+import argparse
+import asyncio
+import json
+import random
+import string
+import time
+from collections import Counter
+from typing import Dict, List, Optional
+import aiohttp
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def random_video_id() -> str:
+    return "".join(random.choices(string.ascii_letters + string.digits + "-_", k=11))
+
+
+def percentile(ordered: List[float], pct: float) -> Optional[float]:
+    if not ordered:
+        return None
+    index = min(int(round(pct / 100 * len(ordered))) - 1, len(ordered) - 1)
+    return ordered[max(index, 0)]
+
+
+def summarize_latencies(latencies: List[float]) -> Dict:
+    ordered = sorted(latencies)
+    return {
+        "count": len(ordered),
+        "p50_ms": _ms(percentile(ordered, 50)),
+        "p95_ms": _ms(percentile(ordered, 95)),
+        "p99_ms": _ms(percentile(ordered, 99)),
+        "max_ms": _ms(ordered[-1] if ordered else None),
+    }
+
+
+def _ms(seconds: Optional[float]) -> Optional[float]:
+    return round(seconds * 1000, 1) if seconds is not None else None
+
+
+class LoadGenerator:
+    """Fires requests on a fixed schedule, independent of how fast responses come back."""
+
+    def __init__(self, target: str, rps: float, duration: float, hit_ratio: float, hot_videos: int,
+                 fields: Optional[List[str]] = None, max_in_flight: int = 1000, timeout: float = 120.0):
+        self.target = target.rstrip("/")
+        self.rps = rps
+        self.duration = duration
+        self.hit_ratio = hit_ratio
+        self.hot_ids = [random_video_id() for _ in range(hot_videos)]
+        self.fields = fields
+        self.semaphore = asyncio.Semaphore(max_in_flight)
+        self.timeout = aiohttp.ClientTimeout(total=timeout)
+        self.results: List[Dict] = []
+
+    def _payload(self, video_id: str) -> Dict:
+        payload = {"url": f"https://www.youtube.com/watch?v={video_id}"}
+        if self.fields:
+            payload["fields"] = self.fields
+        return payload
+
+    async def _request(self, session: aiohttp.ClientSession, video_id: str, kind: str, scheduled_at: Optional[float] = None):
+        # Latency counts from the scheduled send time, so time queued behind max_in_flight or a
+        # late schedule is included (avoids coordinated omission)
+        start = scheduled_at if scheduled_at is not None else time.perf_counter()
+        async with self.semaphore:
+            try:
+                async with session.post(f"{self.target}/api/summarize", json=self._payload(video_id)) as response:
+                    await response.read()
+                    status = response.status
+            except Exception as e:
+                status = type(e).__name__
+            self.results.append({"kind": kind, "status": status, "latency": time.perf_counter() - start})
+
+    async def warm_up(self, session: aiohttp.ClientSession):
+        """Summarize the hot set once so later requests for it are cache hits."""
+        await asyncio.gather(*(self._request(session, video_id, "warmup") for video_id in self.hot_ids))
+        failed = [r for r in self.results if r["status"] != 200]
+        if failed:
+            logger.warning(f"{len(failed)} of {len(self.hot_ids)} warm-up requests failed")
+        self.results.clear()
+
+    async def run(self) -> Dict:
+        async with aiohttp.ClientSession(timeout=self.timeout, connector=aiohttp.TCPConnector(limit=0)) as session:
+            if self.hit_ratio > 0 and self.hot_ids:
+                await self.warm_up(session)
+
+            tasks = []
+            interval = 1.0 / self.rps
+            started = time.perf_counter()
+            next_at = started
+            while next_at - started < self.duration:
+                delay = next_at - time.perf_counter()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                if self.hot_ids and random.random() < self.hit_ratio:
+                    tasks.append(asyncio.create_task(self._request(session, random.choice(self.hot_ids), "hit", next_at)))
+                else:
+                    tasks.append(asyncio.create_task(self._request(session, random_video_id(), "miss", next_at)))
+                next_at += interval
+            await asyncio.gather(*tasks)
+            elapsed = time.perf_counter() - started
+        return self.report(elapsed)
+
+    def report(self, elapsed: float) -> Dict:
+        ok = [r for r in self.results if r["status"] == 200]
+        return {
+            "target_rps": self.rps,
+            "hit_ratio": self.hit_ratio,
+            "requests": len(self.results),
+            "elapsed_s": round(elapsed, 2),
+            "throughput_rps": round(len(ok) / elapsed, 2) if elapsed else 0.0,
+            "error_rate": round(1 - len(ok) / len(self.results), 4) if self.results else 0.0,
+            "statuses": {str(k): v for k, v in Counter(r["status"] for r in self.results).items()},
+            "latency": summarize_latencies([r["latency"] for r in ok]),
+            "latency_hit": summarize_latencies([r["latency"] for r in ok if r["kind"] == "hit"]),
+            "latency_miss": summarize_latencies([r["latency"] for r in ok if r["kind"] == "miss"]),
+        }
+
+
+def add_generator_arguments(parser):
+    parser.add_argument("--duration", type=float, default=30.0, help="Seconds of load per run")
+    parser.add_argument("--hit-ratio", type=float, default=0.8, help="Fraction of requests for already-summarized videos")
+    parser.add_argument("--hot-videos", type=int, default=20, help="Size of the cached video set")
+    parser.add_argument("--fields", nargs="*", default=None, help="Summary fields to request (default: all)")
+    parser.add_argument("--max-in-flight", type=int, default=1000)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Drive /api/summarize at a target request rate.")
+    parser.add_argument("--target", default="http://127.0.0.1:5001")
+    parser.add_argument("--rps", type=float, default=10.0, help="Target request rate")
+    add_generator_arguments(parser)
+    args = parser.parse_args()
+
+    logging.basicConfig(level="INFO")
+    generator = LoadGenerator(args.target, args.rps, args.duration, args.hit_ratio, args.hot_videos, args.fields, args.max_in_flight)
+    print(json.dumps(asyncio.run(generator.run()), indent=2))
+
+
+if __name__ == "__main__":
+    main()
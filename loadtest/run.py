@@ -0,0 +1,113 @@
+# tldw_tube/loadtest/run.py
+"""End-to-end load test: stub YouTube and OpenAI, then sweep gunicorn worker counts and request rates.
+
+The app under test uses the database configured in the environment (DATABASE_URL or DB_*).
+
+    python -m loadtest.run --workers 1 2 4 --rps 5 10 20 40 --duration 30 --hit-ratio 0.8
+"""
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import time
+import urllib.request
+from typing import Dict, List
+from loadtest.generator import LoadGenerator, add_generator_arguments
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def _spawn(args: List[str], env: Dict[str, str]) -> subprocess.Popen:
+    return subprocess.Popen([sys.executable, *args], env=env)
+
+
+def _wait_for(url: str, timeout: float = 60.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with urllib.request.urlopen(url, timeout=2):
+                return
+        except Exception:
+            time.sleep(0.25)
+    raise RuntimeError(f"Timed out waiting for {url}")
+
+
+def _stop(process: subprocess.Popen):
+    process.terminate()
+    try:
+        process.wait(timeout=15)
+    except subprocess.TimeoutExpired:
+        process.kill()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sweep worker counts and request rates against local stubs.")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--app-port", type=int, default=5101)
+    parser.add_argument("--youtube-port", type=int, default=9001)
+    parser.add_argument("--openai-port", type=int, default=9002)
+    parser.add_argument("--youtube-latency-ms", type=float, default=150.0)
+    parser.add_argument("--youtube-error-rate", type=float, default=0.0)
+    parser.add_argument("--openai-latency-ms", type=float, default=500.0)
+    parser.add_argument("--openai-ms-per-token", type=float, default=5.0)
+    parser.add_argument("--openai-error-rate", type=float, default=0.0)
+    parser.add_argument("--extractor-backend", default="html", choices=["html", "player"])
+    parser.add_argument("--output", default="loadtest_results.json")
+    parser.add_argument("--rps", type=float, nargs="+", default=[5, 10, 20, 40], help="Request rates to sweep")
+    add_generator_arguments(parser)
+    args = parser.parse_args()
+
+    logging.basicConfig(level="INFO")
+    env = dict(os.environ)
+    stubs = [
+        _spawn(["-m", "loadtest.stub_youtube", "--port", str(args.youtube_port),
+                "--latency-ms", str(args.youtube_latency_ms), "--error-rate", str(args.youtube_error_rate)], env),
+        _spawn(["-m", "loadtest.stub_openai", "--port", str(args.openai_port),
+                "--latency-ms", str(args.openai_latency_ms), "--ms-per-token", str(args.openai_ms_per_token),
+                "--error-rate", str(args.openai_error_rate)], env),
+    ]
+    app_env = dict(
+        env,
+        YOUTUBE_BASE_URL=f"http://127.0.0.1:{args.youtube_port}",
+        OPENAI_BASE_URL=f"http://127.0.0.1:{args.openai_port}/v1",
+        OPENAI_API_KEY=env.get("OPENAI_API_KEY", "stub"),
+        EXTRACTOR_BACKEND=args.extractor_backend,
+        RATE_LIMIT_COUNT=str(10 ** 9),
+        PROXY_URL="",
+        PROXY_URLS="[]",
+        GUNICORN_BIND=f"127.0.0.1:{args.app_port}",
+    )
+
+    results = []
+    try:
+        _wait_for(f"http://127.0.0.1:{args.youtube_port}/")
+        _wait_for(f"http://127.0.0.1:{args.openai_port}/")
+        for workers in args.workers:
+            app = _spawn(["-m", "gunicorn", "-c", "gunicorn.conf.py", "main:app"], dict(app_env, GUNICORN_WORKERS=str(workers)))
+            try:
+                _wait_for(f"http://127.0.0.1:{args.app_port}/api/health")
+                for rps in args.rps:
+                    generator = LoadGenerator(f"http://127.0.0.1:{args.app_port}", rps, args.duration, args.hit_ratio,
+                                              args.hot_videos, args.fields, args.max_in_flight)
+                    report = dict(asyncio.run(generator.run()), workers=workers)
+                    results.append(report)
+                    latency = report["latency"]
+                    print(f"workers={workers} rps={rps:g} throughput={report['throughput_rps']} "
+                          f"errors={report['error_rate']:.2%} p50={latency['p50_ms']}ms "
+                          f"p95={latency['p95_ms']}ms p99={latency['p99_ms']}ms", flush=True)
+            finally:
+                _stop(app)
+    finally:
+        for stub in stubs:
+            _stop(stub)
+
+    with open(args.output, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"Wrote {len(results)} results to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
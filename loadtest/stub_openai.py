@@ -0,0 +1,75 @@
+# tldw_tube/loadtest/stub_openai.py
+"""Local OpenAI-compatible chat completions endpoint returning canned answers.
+
+    python -m loadtest.stub_openai --port 9002 --latency-ms 800
+    OPENAI_BASE_URL=http://127.0.0.1:9002/v1 ...
+"""
+import argparse
+import asyncio
+import time
+import uuid
+from aiohttp import web
+from loadtest.common import add_fault_arguments, fault_middleware
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def canned_answer(messages) -> str:
+    """Pick a plausible answer for the summarizer step the last prompt belongs to."""
+    prompt = messages[-1]["content"] if messages else ""
+    if "Wikipedia" in prompt:
+        return "Load testing"
+    if "single phrase" in prompt:
+        return "Mostly."
+    if "motivating question" in prompt:
+        return "How does the service behave under load?"
+    if "single sentence" in prompt:
+        return "The service keeps up with the offered load until its workers saturate."
+    if "themes" in prompt:
+        return "### Throughput\n**Sentiment: Neutral**\nRequests are served at the offered rate.\n\n### Latency\n**Sentiment: Neutral**\nTail latency grows near saturation."
+    return "This is a stub summary generated for load testing. " * 4
+
+
+def create_app(latency_ms: float = 0.0, jitter_ms: float = 0.0, error_rate: float = 0.0, ms_per_token: float = 0.0) -> web.Application:
+    async def chat_completions(request: web.Request) -> web.Response:
+        body = await request.json()
+        content = canned_answer(body.get("messages", []))
+        completion_tokens = len(content.split())
+        if ms_per_token:
+            # Generation time grows with output length, which is what makes themes the slowest step
+            await asyncio.sleep(completion_tokens * ms_per_token / 1000)
+        prompt_tokens = sum(len(str(m.get("content", "")).split()) for m in body.get("messages", []))
+        return web.json_response({
+            "id": f"chatcmpl-{uuid.uuid4().hex}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body.get("model", "gpt-4o"),
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}],
+            "usage": {"prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens, "total_tokens": prompt_tokens + completion_tokens},
+        })
+
+    async def root(request: web.Request) -> web.Response:
+        return web.Response(text="")
+
+    app = web.Application(middlewares=[fault_middleware(latency_ms, jitter_ms, error_rate)])
+    app.router.add_post("/v1/chat/completions", chat_completions)
+    app.router.add_get("/", root)
+    return app
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve an OpenAI-compatible chat completions stub.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9002)
+    parser.add_argument("--ms-per-token", type=float, default=0.0, help="Extra latency per generated word")
+    add_fault_arguments(parser)
+    args = parser.parse_args()
+
+    logging.basicConfig(level="INFO")
+    app = create_app(args.latency_ms, args.jitter_ms, args.error_rate, args.ms_per_token)
+    web.run_app(app, host=args.host, port=args.port, access_log=None)
+
+
+if __name__ == "__main__":
+    main()
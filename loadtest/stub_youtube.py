@@ -0,0 +1,110 @@
+# tldw_tube/loadtest/stub_youtube.py
+"""Local stand-in for YouTube: watch pages, the player endpoint and caption files.
+
+Any video id is served. Recorded fixtures (watch_<id>.html, captions_<id>.vtt, or the
+video_info_<id>.json / captions_<id>.json files written to the cache directory) are used
+when present; otherwise the default fixture is served under the requested id so cold
+cache misses can be generated at will.
+
+    python -m loadtest.stub_youtube --port 9001 --latency-ms 120 --error-rate 0.01
+"""
+import argparse
+import glob
+import json
+import os
+from typing import Dict, Optional
+from aiohttp import web
+from benchmarks.fixtures import player_response, synthesize_watch_page
+from loadtest.common import add_fault_arguments, fault_middleware
+import logging
+
+logger = logging.getLogger(__name__)
+
+YOUTUBE_ORIGIN = "https://www.youtube.com"
+
+
+class FixtureStore:
+    """Recorded responses keyed by video id, with a default used for unknown ids."""
+
+    def __init__(self, fixtures_dir: str, page_padding_kb: int):
+        self.fixtures_dir = fixtures_dir
+        self.page_padding_kb = page_padding_kb
+        self.video_info: Dict[str, Dict] = {}
+        for path in glob.glob(os.path.join(fixtures_dir, "video_info_*.json")):
+            with open(path) as f:
+                data = json.load(f)
+            self.video_info[data["id"]] = data
+        if not self.video_info:
+            raise SystemExit(f"No video_info_*.json fixtures found in {fixtures_dir}")
+        self.default_id = sorted(self.video_info)[0]
+
+    def _read(self, name: str) -> Optional[str]:
+        path = os.path.join(self.fixtures_dir, name)
+        if not os.path.exists(path):
+            return None
+        with open(path) as f:
+            return f.read()
+
+    def player_response(self, video_id: str, base_url: str) -> Dict:
+        return player_response(self.video_info.get(video_id, self.video_info[self.default_id]), video_id, base_url)
+
+    def watch_page(self, video_id: str, base_url: str) -> str:
+        recorded = self._read(f"watch_{video_id}.html")
+        if recorded is not None:
+            return recorded.replace(f"{YOUTUBE_ORIGIN}/api/timedtext", f"{base_url}/api/timedtext")
+        return synthesize_watch_page(self.player_response(video_id, base_url), self.page_padding_kb)
+
+    def captions(self, video_id: str) -> str:
+        for candidate in (video_id, self.default_id):
+            recorded = self._read(f"captions_{candidate}.vtt")
+            if recorded is not None:
+                return recorded
+            cached = self._read(f"captions_{candidate}.json")
+            if cached is not None:
+                return json.loads(cached)
+        raise web.HTTPNotFound(text="No caption fixture")
+
+
+def create_app(store: FixtureStore, latency_ms: float = 0.0, jitter_ms: float = 0.0, error_rate: float = 0.0) -> web.Application:
+    def base_url(request: web.Request) -> str:
+        return f"{request.scheme}://{request.host}"
+
+    async def watch(request: web.Request) -> web.Response:
+        video_id = request.query.get("v", "")
+        return web.Response(text=store.watch_page(video_id, base_url(request)), content_type="text/html")
+
+    async def player(request: web.Request) -> web.Response:
+        body = await request.json()
+        return web.json_response(store.player_response(body.get("videoId", ""), base_url(request)))
+
+    async def timedtext(request: web.Request) -> web.Response:
+        return web.Response(text=store.captions(request.query.get("v", "")), content_type="text/vtt")
+
+    async def root(request: web.Request) -> web.Response:
+        return web.Response(text="")
+
+    app = web.Application(middlewares=[fault_middleware(latency_ms, jitter_ms, error_rate)])
+    app.router.add_get("/watch", watch)
+    app.router.add_post("/youtubei/v1/player", player)
+    app.router.add_get("/api/timedtext", timedtext)
+    app.router.add_get("/", root)
+    return app
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve recorded YouTube fixtures for load testing.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9001)
+    parser.add_argument("--fixtures-dir", default="./cache")
+    parser.add_argument("--page-padding-kb", type=int, default=900, help="Padding added to synthesized watch pages")
+    add_fault_arguments(parser)
+    args = parser.parse_args()
+
+    logging.basicConfig(level="INFO")
+    store = FixtureStore(args.fixtures_dir, args.page_padding_kb)
+    app = create_app(store, args.latency_ms, args.jitter_ms, args.error_rate)
+    web.run_app(app, host=args.host, port=args.port, access_log=None)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,12 @@
 # tldw_tube/main.py
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from api.routers import summaries
+from api.routers import summaries, profiles, transcripts, search, export
 import logging
 from core.config import settings
 import uvicorn
-from database.database import engine  # Add import
-from database import models  # Add import
+from core.startup import bootstrap_schema, warm_worker, shutdown_worker
+from database.database import pool_stats
 
 # Configure logging
 logging.basicConfig(level=settings.log_level)
@@ -30,29 +30,39 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Function to initialize database schema (called before Gunicorn starts)
+# Function to initialize database schema (gunicorn runs this once in the master, see gunicorn.conf.py;
+# other launchers get it from warm_worker)
 def init_db():
     """Initialize the database schema."""
-    models.Base.metadata.create_all(bind=engine)
+    bootstrap_schema()
 
-# Optional: Keep startup_even for other runtime initialization if needed
 @app.on_event("startup")
-def startup_event():
-    """Handle startup events (e.g., logging or runtime initialization)."""
+async def startup_event():
+    """Warm this worker's database and HTTP connection pools before serving."""
     logger.info("Application starting up...")
+    await warm_worker()
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Release this worker's shared connections."""
+    await shutdown_worker()
 
 # Include the API router
 app.include_router(summaries.router, prefix="/api")
+app.include_router(profiles.router, prefix="/api")
+app.include_router(transcripts.router, prefix="/api")
+app.include_router(search.router, prefix="/api")
+app.include_router(export.router, prefix="/api")
 
 @app.get("/api/health", response_model=dict)
 async def health_check():
     """Health check endpoint."""
     return {"status": "healthy"}
 
+@app.get("/api/health/db", response_model=dict)
+async def database_health():
+    """Connection pool occupancy and checkout wait times for this worker."""
+    return {"pools": pool_stats()}
+
 if __name__ == "__main__":
     uvicorn.run(app, host="0.0.0.0", port=5001, log_level=settings.log_level.lower())
-
-# For Docker: Call init_db() when run as a standalone script
-if __name__ != "__main__":
-    # This runs only in Docker via CMD, not when imported as a module
-    init_db()
\ No newline at end of file
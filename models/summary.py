@@ -2,11 +2,14 @@
 from pydantic import BaseModel, HttpUrl
 from typing import Optional
 
+# Summary fields in the order the summarizer produces them
+SUMMARY_FIELDS = ("paragraph", "sentence", "question", "word", "wikipedia", "themes")
+
 class SummaryData(BaseModel):
-    paragraph: str
-    sentence: str
-    question: str
-    word: str
+    # Fields are optional so partially computed summaries can be returned and cached
+    paragraph: Optional[str] = None
+    sentence: Optional[str] = None
+    question: Optional[str] = None
+    word: Optional[str] = None
     wikipedia: Optional[HttpUrl] = None # Use HttpUrl
-    themes: str
-
+    themes: Optional[str] = None
@@ -1,6 +1,7 @@
 # tldw_tube/models/video.py
+from dataclasses import dataclass
 from pydantic import BaseModel, HttpUrl
-from typing import Dict, List, Optional
+from typing import Any, Dict, List, Optional
 
 class CaptionTrack(BaseModel):
     url: str
@@ -17,3 +18,35 @@ class VideoMetadata(BaseModel):
     webpage_url: str
     subtitles: Dict[str, List[CaptionTrack]]
     automatic_captions: Dict[str, List[CaptionTrack]]
+
+@dataclass(frozen=True, slots=True)
+class CompactVideoMetadata:
+    """The fields the summarization pipeline reads, with the caption track already selected.
+
+    This is what gets cached and passed around per request; the full
+    VideoMetadata (every caption track in every language) is only built while
+    extracting and is not cached.
+    """
+    id: str
+    title: str
+    description: str
+    duration: int
+    thumbnail_url: Optional[str]
+    aspect_ratio: float
+    webpage_url: str
+    caption_url: Optional[str] = None
+    caption_ext: Optional[str] = None
+    caption_name: Optional[str] = None
+
+    @property
+    def caption_track(self) -> Optional[CaptionTrack]:
+        if self.caption_url is None:
+            return None
+        return CaptionTrack(url=self.caption_url, ext=self.caption_ext, name=self.caption_name)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "CompactVideoMetadata":
+        return cls(**data)
@@ -1,30 +1,46 @@
 # tldw_tube/services/cache_service.py
 # import os # No longer needed
 # import json # No longer needed
-from typing import Optional, Any
+from typing import Optional, Any, Dict
 from core.config import settings
 import logging
-from fastapi import Depends 
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
-from database.database import get_db  # Import the get_db dependency
+from database.database import SessionLocal, ReadSessionLocal  # Writes go to the primary, reads to a replica
 from database import crud # Import the crud operations
+from services.search_service import index_cache_write
 
 logger = logging.getLogger(__name__)
 
+# Summaries preloaded into worker memory at startup, keyed by cache key
+_preloaded_summaries: Dict[str, Dict] = {}
+
+def preload_summaries(db: Session, limit: int) -> int:
+    """Load the most recent summaries into memory so the hottest videos skip the database."""
+    _preloaded_summaries.clear()
+    _preloaded_summaries.update(crud.get_recent_summary_caches(db, limit))
+    return len(_preloaded_summaries)
+
 class CacheService:
-    def __init__(self, db: Session = Depends(get_db)):  # Use dependency injection
-        self.db = db
+    def __init__(self):
+        # Each operation opens a short-lived session on the engine for its role
+        self.write_session = SessionLocal
+        self.read_session = ReadSessionLocal
 
-    def get(self, key: str, cache_type: str = "video") -> Optional[Any]:
-        """Retrieve data from the database cache."""
+    def get(self, key: str, cache_type: str = "video", primary: bool = False) -> Optional[Any]:
+        """Retrieve data from the database cache; `primary` skips replicas and preloaded copies that may lag."""
+        if cache_type == "summary" and key in _preloaded_summaries and not primary:
+            return dict(_preloaded_summaries[key])
         try:
-            with self.db as db: # Use "with" statement for session management.
+            with (self.write_session if primary else self.read_session)() as db: # Use "with" statement for session management.
                 if cache_type == "video":
                     return crud.get_video_cache(db, key)
                 elif cache_type == "caption":
                     return crud.get_caption_cache(db, key)
                 elif cache_type == "summary":
                     return crud.get_summary_cache(db, key)
+                elif cache_type == "transcript":
+                    return crud.get_transcript_cache(db, key)
                 else:
                     logger.warning(f"Unknown cache type: {cache_type}")
                     return None
@@ -35,8 +51,10 @@ class CacheService:
 
     def set(self, key: str, data: Any, cache_type: str = "video"):
         """Store data in the database cache."""
+        if cache_type == "summary" and key in _preloaded_summaries:
+            _preloaded_summaries[key] = data
         try:
-            with self.db as db:
+            with self.write_session() as db:
                 if cache_type == "video":
                     existing = crud.get_video_cache(db, key)
                     if existing:
@@ -55,10 +73,52 @@ class CacheService:
                         crud.update_summary_cache(db, key, data)
                     else:
                         crud.create_summary_cache(db, key, data)
+                elif cache_type == "transcript":
+                    existing = crud.get_transcript_cache(db, key)
+                    if existing:
+                        crud.update_transcript_cache(db, key, data)
+                    else:
+                        crud.create_transcript_cache(db, key, data)
                 else:
                     logger.warning(f"Unknown cache type: {cache_type}")
+                    return
         except Exception as e:
             logger.error(f"Error setting cache: {type(e).__name__} - {e}")
+            return
+
+        try:
+            index_cache_write(key, data)
+        except Exception as e:
+            logger.error(f"Error updating search index: {type(e).__name__} - {e}")
+
+    def merge_summary(self, key: str, fields: Dict) -> Optional[Dict]:
+        """Merge fields into a cached summary with a read-modify-write on the primary.
+
+        Reading from a replica first could miss fields another worker just
+        stored and then overwrite them.
+        """
+        merged = None
+        for attempt in range(2):
+            try:
+                with self.write_session() as db:
+                    merged = crud.merge_summary_cache(db, key, fields)
+                break
+            except IntegrityError:
+                continue  # Another worker created the row first; merge into theirs
+            except Exception as e:
+                logger.error(f"Error merging summary cache: {type(e).__name__} - {e}")
+                return None
+        if merged is None:
+            logger.error(f"Error merging summary cache: {key} kept conflicting")
+            return None
+
+        if key in _preloaded_summaries:
+            _preloaded_summaries[key] = merged
+        try:
+            index_cache_write(key, merged)
+        except Exception as e:
+            logger.error(f"Error updating search index: {type(e).__name__} - {e}")
+        return merged
 
     def delete(self, key: str, cache_type: str = "video"):
         """Delete a key from the cache"""
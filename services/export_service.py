@@ -0,0 +1,149 @@
+# tldw_tube/services/export_service.py
+"""Streaming export of the summary corpus as NDJSON or CSV.
+
+    python -m services.export_service --format csv --updated-from 2025-02-01 --output summaries.csv
+    python -m services.export_service --after dQw4w9WgXcQ   # resume after the last exported video id
+"""
+import argparse
+import csv
+import io
+import json
+import sys
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional
+from sqlalchemy import func, select
+from core.config import settings
+from database.database import ReadSessionLocal
+from database.models import SummaryCache, VideoCache
+from models.summary import SUMMARY_FIELDS
+import logging
+
+logger = logging.getLogger(__name__)
+
+SUMMARY_PREFIX = "summaries_"
+VIDEO_PREFIX = "video_info_"
+EXPORT_FORMATS = ("ndjson", "csv")
+EXPORT_COLUMNS = ("video_id", "title", "duration", "webpage_url", "thumbnail_url", "created_at", "updated_at") + SUMMARY_FIELDS
+
+
+def iter_summary_batches(
+    created_from: Optional[datetime] = None,
+    created_to: Optional[datetime] = None,
+    updated_from: Optional[datetime] = None,
+    updated_to: Optional[datetime] = None,
+    after: Optional[str] = None,
+    limit: Optional[int] = None,
+    batch_size: int = 1000,
+) -> Iterator[List[Dict]]:
+    """Yield export rows in video id order, one list per batch, with constant memory.
+
+    Rows are streamed through a server-side cursor on a read replica, `batch_size`
+    at a time, and each batch's video metadata is fetched with one keyed lookup.
+    `after` is the last video id of a previous export, for resuming. Rows never
+    updated count as updated when they were created.
+    """
+    modified_at = func.coalesce(SummaryCache.updated_at, SummaryCache.created_at)
+    stmt = select(SummaryCache.id, SummaryCache.data, SummaryCache.created_at, modified_at.label("updated_at"))
+    if created_from is not None:
+        stmt = stmt.where(SummaryCache.created_at >= created_from)
+    if created_to is not None:
+        stmt = stmt.where(SummaryCache.created_at < created_to)
+    if updated_from is not None:
+        stmt = stmt.where(modified_at >= updated_from)
+    if updated_to is not None:
+        stmt = stmt.where(modified_at < updated_to)
+    if after:
+        stmt = stmt.where(SummaryCache.id > SUMMARY_PREFIX + after)
+    stmt = stmt.where(SummaryCache.id.startswith(SUMMARY_PREFIX)).order_by(SummaryCache.id)
+    if limit is not None:
+        stmt = stmt.limit(limit)
+
+    with ReadSessionLocal() as db:
+        result = db.execute(stmt.execution_options(stream_results=True, yield_per=batch_size))
+        for batch in result.partitions():
+            video_ids = [row.id[len(SUMMARY_PREFIX):] for row in batch]
+            videos = dict(db.execute(
+                select(VideoCache.id, VideoCache.data).where(VideoCache.id.in_([VIDEO_PREFIX + v for v in video_ids]))
+            ).all())
+            rows = []
+            for video_id, row in zip(video_ids, batch):
+                video = videos.get(VIDEO_PREFIX + video_id) or {}
+                summary = row.data or {}
+                rows.append({
+                    "video_id": video_id,
+                    "title": video.get("title"),
+                    "duration": video.get("duration"),
+                    "webpage_url": video.get("webpage_url"),
+                    "thumbnail_url": video.get("thumbnail_url"),
+                    "created_at": row.created_at.isoformat() if row.created_at else None,
+                    "updated_at": row.updated_at.isoformat() if row.updated_at else None,
+                    **{field: summary.get(field) for field in SUMMARY_FIELDS},
+                })
+            yield rows
+
+
+def format_ndjson(batches: Iterator[List[Dict]]) -> Iterator[str]:
+    for rows in batches:
+        yield "".join(json.dumps(row, ensure_ascii=False) + "\n" for row in rows)
+
+
+def format_csv(batches: Iterator[List[Dict]]) -> Iterator[str]:
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=EXPORT_COLUMNS)
+    writer.writeheader()
+    for rows in batches:
+        writer.writerows(rows)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():  # No rows: still send the header
+        yield buffer.getvalue()
+
+
+def export_summaries(export_format: str = "ndjson", **filters) -> Iterator[str]:
+    """Export rows serialized in `export_format`, one chunk per database batch.
+
+    Chunks are per batch rather than per row because a streaming response hops to a
+    worker thread and sends one body message for every chunk.
+    """
+    if export_format not in EXPORT_FORMATS:
+        raise ValueError(f"Unsupported export format: {export_format}")
+    batches = iter_summary_batches(**filters)
+    return format_ndjson(batches) if export_format == "ndjson" else format_csv(batches)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Stream the summary corpus as NDJSON or CSV.")
+    parser.add_argument("--format", choices=EXPORT_FORMATS, default="ndjson")
+    parser.add_argument("--created-from", type=datetime.fromisoformat)
+    parser.add_argument("--created-to", type=datetime.fromisoformat)
+    parser.add_argument("--updated-from", type=datetime.fromisoformat)
+    parser.add_argument("--updated-to", type=datetime.fromisoformat)
+    parser.add_argument("--after", help="Resume after this video id")
+    parser.add_argument("--limit", type=int)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--output", help="File to write (default: stdout)")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=settings.log_level, stream=sys.stderr)
+    chunks = export_summaries(
+        args.format,
+        created_from=args.created_from,
+        created_to=args.created_to,
+        updated_from=args.updated_from,
+        updated_to=args.updated_to,
+        after=args.after,
+        limit=args.limit,
+        batch_size=args.batch_size,
+    )
+    out = open(args.output, "w", newline="", encoding="utf-8") if args.output else sys.stdout
+    try:
+        for chunk in chunks:
+            out.write(chunk)
+    finally:
+        if args.output:
+            out.close()
+
+
+if __name__ == "__main__":
+    main()
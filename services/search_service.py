@@ -0,0 +1,218 @@
+# tldw_tube/services/search_service.py
+import asyncio
+import base64
+import json
+import math
+import re
+import threading
+from collections import Counter, defaultdict
+from typing import Any, Dict, List, Optional, Tuple
+from sqlalchemy import and_, cast, func, literal, literal_column, or_, select
+from sqlalchemy.dialects.postgresql import REGCONFIG, insert
+from core.config import settings
+from database.database import engine, SessionLocal, ReadSessionLocal
+from database.models import SearchDocument, VideoCache, SummaryCache, CaptionCache
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Cache key prefix -> search document field it feeds. Transcripts are indexed separately
+# (see index_transcript_in_background) so cache writes never re-parse captions.
+KEY_FIELDS = {"video_info_": "title", "summaries_": "summary"}
+SUMMARY_TEXT_FIELDS = ("sentence", "question", "word", "paragraph", "themes")
+FIELD_WEIGHTS = {"title": "A", "summary": "B", "transcript": "C"}
+
+
+def encode_cursor(rank: float, video_id: str) -> str:
+    return base64.urlsafe_b64encode(json.dumps([rank, video_id]).encode()).decode()
+
+
+def decode_cursor(cursor: str) -> Tuple[float, str]:
+    try:
+        rank, video_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return float(rank), str(video_id)
+    except Exception as e:
+        raise ValueError("Invalid search cursor") from e
+
+
+def document_field(key: str, data: Any) -> Optional[Tuple[str, str, str]]:
+    """Map a cache write to (video_id, field, text), or None if it does not feed the search index."""
+    for prefix, field in KEY_FIELDS.items():
+        if not key.startswith(prefix):
+            continue
+        video_id = key[len(prefix):]
+        if field == "title":
+            return video_id, field, (data or {}).get("title", "")
+        return video_id, field, "\n".join((data or {}).get(name) or "" for name in SUMMARY_TEXT_FIELDS)
+    return None
+
+
+class PostgresSearchBackend:
+    """tsvector column with a GIN index, ranked with ts_rank_cd."""
+
+    def _field_vector(self, field: str, value):
+        language = cast(literal(settings.search_language), REGCONFIG)
+        return func.setweight(func.to_tsvector(language, func.coalesce(value, "")), literal(FIELD_WEIGHTS[field]))
+
+    def update(self, video_id: str, field: str, text: str):
+        values = {"title": "", "summary": "", "transcript": ""}
+        values[field] = text
+        stmt = insert(SearchDocument).values(id=video_id, document=self._field_vector(field, literal(text)), **values)
+        # Only the written field is tokenized. The other fields' lexemes are carried over from the
+        # stored vector by their weight, so a title or summary write never re-tokenizes the transcript.
+        parts = [
+            self._field_vector(name, getattr(stmt.excluded, name)) if name == field
+            else func.ts_filter(SearchDocument.document, literal_column(f"'{{{weight.lower()}}}'"))
+            for name, weight in FIELD_WEIGHTS.items()
+        ]
+        document = parts[0].op("||")(parts[1]).op("||")(parts[2])
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[SearchDocument.id],
+            set_={field: getattr(stmt.excluded, field), "document": document, "updated_at": func.now()},
+        )
+        with SessionLocal() as db:
+            db.execute(stmt)
+            db.commit()
+
+    def search(self, query: str, limit: int, after: Optional[Tuple[float, str]]) -> List[Dict]:
+        tsquery = func.websearch_to_tsquery(cast(literal(settings.search_language), REGCONFIG), query)
+        rank = func.ts_rank_cd(SearchDocument.document, tsquery)
+        stmt = (
+            select(SearchDocument.id, SearchDocument.title, func.left(SearchDocument.summary, 300).label("snippet"), rank.label("rank"))
+            .where(SearchDocument.document.op("@@")(tsquery))
+        )
+        if after is not None:
+            after_rank, after_id = after
+            stmt = stmt.where(or_(rank < after_rank, and_(rank == after_rank, SearchDocument.id > after_id)))
+        stmt = stmt.order_by(rank.desc(), SearchDocument.id.asc()).limit(limit)
+        with ReadSessionLocal() as db:
+            rows = db.execute(stmt).all()
+        return [{"video_id": r.id, "title": r.title, "snippet": r.snippet, "rank": float(r.rank)} for r in rows]
+
+
+class InMemorySearchBackend:
+    """Pure-Python inverted index for tests and non-Postgres databases; per process, not persisted."""
+
+    WEIGHTS = {"title": 1.0, "summary": 0.4, "transcript": 0.2}  # Postgres' default A/B/C weights
+    TOKEN = re.compile(r"\w+")
+
+    def __init__(self):
+        self.fields: Dict[str, Dict[str, str]] = defaultdict(lambda: {"title": "", "summary": "", "transcript": ""})
+        self.term_counts: Dict[str, Dict[str, Counter]] = defaultdict(dict)
+        self.postings: Dict[str, set] = defaultdict(set)
+        self.lock = threading.Lock()
+
+    def tokens(self, text: str) -> List[str]:
+        return self.TOKEN.findall(text.lower())
+
+    def update(self, video_id: str, field: str, text: str):
+        with self.lock:
+            old = self.term_counts[video_id].get(field, Counter())
+            new = Counter(self.tokens(text))
+            self.fields[video_id][field] = text
+            self.term_counts[video_id][field] = new
+            for term in set(old) - set(new):
+                if not any(term in counts for counts in self.term_counts[video_id].values()):
+                    self.postings[term].discard(video_id)
+            for term in new:
+                self.postings[term].add(video_id)
+
+    def _rank(self, video_id: str, terms: List[str]) -> float:
+        score = 0.0
+        for field, counts in self.term_counts[video_id].items():
+            length = sum(counts.values())
+            matched = sum(counts[term] for term in terms)
+            if matched:
+                score += self.WEIGHTS[field] * matched / (1 + math.log1p(length))
+        return score
+
+    def search(self, query: str, limit: int, after: Optional[Tuple[float, str]]) -> List[Dict]:
+        terms = self.tokens(query)
+        if not terms:
+            return []
+        with self.lock:
+            matches = set.intersection(*(self.postings.get(term, set()) for term in terms))
+            ranked = sorted(((self._rank(video_id, terms), video_id) for video_id in matches), key=lambda r: (-r[0], r[1]))
+            if after is not None:
+                ranked = [r for r in ranked if r[0] < after[0] or (r[0] == after[0] and r[1] > after[1])]
+            return [
+                {"video_id": video_id, "title": self.fields[video_id]["title"], "snippet": self.fields[video_id]["summary"][:300], "rank": rank}
+                for rank, video_id in ranked[:limit]
+            ]
+
+
+_backend = None
+
+def get_search_backend():
+    global _backend
+    if _backend is None:
+        kind = settings.search_backend
+        if kind == "auto":
+            kind = "postgres" if engine.dialect.name == "postgresql" else "memory"
+        _backend = PostgresSearchBackend() if kind == "postgres" else InMemorySearchBackend()
+        logger.info(f"Using {kind} search backend")
+    return _backend
+
+
+def index_cache_write(key: str, data: Any):
+    """Keep the search index in step with a cache write; called by CacheService.set."""
+    mapped = document_field(key, data)
+    if mapped is not None:
+        get_search_backend().update(*mapped)
+
+
+def _index_transcript(video_id: str, text: str):
+    try:
+        get_search_backend().update(video_id, "transcript", text)
+    except Exception as e:
+        logger.error(f"Error indexing transcript for {video_id}: {type(e).__name__} - {e}")
+
+
+def index_transcript_in_background(video_id: str, text: str) -> asyncio.Future:
+    """Index already parsed transcript text in the default executor; call once, when captions are first downloaded."""
+    return asyncio.get_running_loop().run_in_executor(None, _index_transcript, video_id, text)
+
+
+class SearchService:
+    def search(self, query: str, limit: int = 20, cursor: Optional[str] = None) -> Dict:
+        """Rank cached videos against a query, paginated with an opaque (rank, id) keyset cursor."""
+        after = decode_cursor(cursor) if cursor else None
+        results = get_search_backend().search(query, limit + 1, after)
+        next_cursor = None
+        if len(results) > limit:
+            results = results[:limit]
+            next_cursor = encode_cursor(results[-1]["rank"], results[-1]["video_id"])
+        return {"results": results, "next_cursor": next_cursor}
+
+
+def _caption_text(captions: str) -> str:
+    from core.caption_processor import CaptionProcessor  # Only needed by the offline reindex
+    try:
+        return CaptionProcessor().parse_captions("vtt", captions)  # Downloads are always VTT
+    except ValueError:
+        return ""
+
+
+def reindex_cached_videos(batch_size: int = 500) -> int:
+    """Index every existing cache row, e.g. after enabling search on a populated database."""
+    count = 0
+    for model in (VideoCache, SummaryCache, CaptionCache):
+        last_id = ""
+        while True:
+            with ReadSessionLocal() as db:
+                rows = db.query(model.id, model.data).filter(model.id > last_id).order_by(model.id).limit(batch_size).all()
+            if not rows:
+                break
+            for key, data in rows:
+                if model is CaptionCache:
+                    _index_transcript(key[len("captions_"):], _caption_text(data))
+                else:
+                    index_cache_write(key, data)
+                count += 1
+            last_id = rows[-1].id
+    return count
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=settings.log_level)
+    logger.info(f"Reindexed {reindex_cached_videos()} cache rows")
@@ -0,0 +1,52 @@
+# tldw_tube/services/transcript_service.py
+import threading
+from collections import OrderedDict
+from typing import Optional
+from core.caption_processor import CaptionProcessor
+from core.transcript import TranscriptIndex
+from services.cache_service import CacheService
+from fastapi import Depends
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Recently used indexes kept in worker memory so repeated segment queries skip the database
+_loaded_indexes: "OrderedDict[str, TranscriptIndex]" = OrderedDict()
+_loaded_lock = threading.Lock()
+MAX_LOADED_INDEXES = 64
+
+
+class TranscriptService:
+    def __init__(self, cache: CacheService = Depends(CacheService)):
+        self.cache = cache
+        self.caption_processor = CaptionProcessor()
+
+    def get_index(self, video_id: str) -> Optional[TranscriptIndex]:
+        """Load a video's transcript index, building it from cached captions on first use."""
+        with _loaded_lock:
+            index = _loaded_indexes.get(video_id)
+            if index is not None:
+                _loaded_indexes.move_to_end(video_id)
+                return index
+
+        data = self.cache.get(f"transcript_{video_id}", cache_type="transcript")
+        if data is not None:
+            index = TranscriptIndex.from_bytes(data)
+        else:
+            captions = self.cache.get(f"captions_{video_id}", cache_type="caption")
+            if not captions:
+                return None
+            try:
+                _, cues = self.caption_processor.parse_captions_with_cues("vtt", captions)  # Downloads are always VTT
+            except ValueError as e:
+                logger.error(f"Error building transcript for {video_id}: {str(e)}")
+                return None
+            index = TranscriptIndex.from_cues(cues)
+            self.cache.set(f"transcript_{video_id}", index.to_bytes(), cache_type="transcript")
+            logger.info(f"Built transcript index for {video_id} ({len(index)} cues)")
+
+        with _loaded_lock:
+            _loaded_indexes[video_id] = index
+            while len(_loaded_indexes) > MAX_LOADED_INDEXES:
+                _loaded_indexes.popitem(last=False)
+        return index
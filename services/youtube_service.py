@@ -1,11 +1,14 @@
 # tldw_tube/services/youtube_service.py
-import aiohttp
+from core import profiling
+from core.startup import http_session
 from core.video_extractor import VideoExtractor
 from core.caption_processor import CaptionProcessor
 from core.summarizer import Summarizer
-from models.video import VideoMetadata, CaptionTrack
+from services.cache_service import CacheService
+from services.search_service import index_transcript_in_background
+from models.video import CaptionTrack
 from models.summary import SummaryData
-from typing import Optional
+from typing import List, Optional
 import logging
 from fastapi import Depends # Add import
 from database.database import get_db # Add import
@@ -17,14 +20,16 @@ logger = logging.getLogger(__name__)
 class YouTubeService:
     def __init__(self, db: Session = Depends(get_db), proxy: Optional[str] = None):
         self.db = db # Add this
-        self.video_extractor = VideoExtractor(proxy=proxy)
+        self.cache = CacheService()
+        self.video_extractor = VideoExtractor(proxy=proxy, cache=self.cache)
         self.caption_processor = CaptionProcessor()
-        self.summarizer = Summarizer()
+        self.summarizer = Summarizer(cache=self.cache)
 
-    async def summarize_video(self, url: str) -> Optional[dict]:
-        """Summarizes a YouTube video given its URL."""
-        async with aiohttp.ClientSession() as session:
-            video_metadata = await self.video_extractor.extract_video_info_async(url, session)
+    async def summarize_video(self, url: str, fields: Optional[List[str]] = None) -> Optional[dict]:
+        """Summarizes a YouTube video given its URL, computing only `fields` up front if given."""
+        async with http_session() as session:
+            with profiling.stage("metadata"):
+                video_metadata = await self.video_extractor.extract_video_info_async(url, session)
             if not video_metadata:
                 logger.error(f"Failed to extract video metadata for URL: {url}")
                 return None
@@ -33,22 +38,28 @@ class YouTubeService:
                 logger.warning(f"Video too long to summarize (duration: {video_metadata.duration}s)")
                 return None
 
-            caption_track = self.video_extractor.get_captions_by_priority(video_metadata)
+            caption_track = video_metadata.caption_track
             if not caption_track:
                 logger.error(f"No captions found for video: {video_metadata.id}")
                 return None
 
             try:
-                downloaded_captions = await self.video_extractor.download_captions_async(video_metadata.id, caption_track, session)
-                caption_text = self.caption_processor.parse_captions(caption_track.ext, downloaded_captions)
+                with profiling.stage("caption_download"):
+                    downloaded_captions, fresh_captions = await self.video_extractor.fetch_captions_async(video_metadata.id, caption_track, session)
+                with profiling.stage("caption_parse"):
+                    caption_text = self.caption_processor.parse_captions(caption_track.ext, downloaded_captions)
 
             except ValueError as e:
                 logger.error(f"Error during caption processing {str(e)}")
                 return None
 
-            summaries = await self.summarizer.summarize_async(
-                caption_text, video_metadata.title, video_metadata.description, video_metadata.id
-            )
+            if fresh_captions:  # Cached captions were indexed when first downloaded
+                index_transcript_in_background(video_metadata.id, caption_text)
+
+            with profiling.stage("summarize"):
+                summaries = await self.summarizer.summarize_async(
+                    caption_text, video_metadata.title, video_metadata.description, video_metadata.id, fields=fields
+                )
             if not summaries:
                 logger.error(f"Failed to generate summaries for video: {video_metadata.id}")
                 return None
@@ -0,0 +1,28 @@
+# tldw_tube/tests/conftest.py
+import os
+import tempfile
+
+# Settings and engines are built at import time, so point them at throwaway sqlite files first
+_tmp = tempfile.mkdtemp(prefix="tldw_tube_tests_")
+os.environ.setdefault("OPENAI_API_KEY", "test-key")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{_tmp}/primary.db")
+os.environ.setdefault("DB_READ_URLS", f'["sqlite:///{_tmp}/replica.db"]')
+os.environ.setdefault("CACHE_DIR", _tmp)
+os.environ.setdefault("ADMIN_TOKEN", "test-admin-token")
+os.environ.setdefault("STARTUP_WARM_HTTP", "false")
+os.environ.setdefault("SEARCH_BACKEND", "memory")
+os.environ.setdefault("RATE_LIMIT_COUNT", "1000")
+
+import pytest
+
+
+@pytest.fixture(scope="session", autouse=True)
+def database():
+    """Create the schema on the primary and on the replica stand-in."""
+    from database.database import Base, all_engines
+    from database import models  # noqa: F401  Registers the tables
+    for engine in all_engines():
+        Base.metadata.create_all(bind=engine)
+    yield
+    for engine in all_engines():
+        engine.dispose()
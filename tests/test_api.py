@@ -0,0 +1,97 @@
+# tldw_tube/tests/test_api.py
+import pytest
+from fastapi.testclient import TestClient
+from core.profiling import PROFILE_ID_HEADER
+from core.utils import ADMIN_HEADER
+from services.youtube_service import YouTubeService
+from main import app
+
+ADMIN_TOKEN = "test-admin-token"
+VIDEO_URL = "https://www.youtube.com/watch?v=ZxCY6RF_ZB0"
+RESULT = {
+    "video_id": "ZxCY6RF_ZB0",
+    "title": "Title",
+    "thumbnail_url": "https://i.ytimg.com/vi/ZxCY6RF_ZB0/hqdefault.jpg",
+    "aspect_ratio": 1.78,
+    "webpage_url": VIDEO_URL,
+    "summary": {},
+}
+
+
+class _FakeYouTubeService:
+    outcome = RESULT
+
+    async def summarize_video(self, url, fields=None):
+        if isinstance(self.outcome, Exception):
+            raise self.outcome
+        return self.outcome
+
+
+@pytest.fixture
+def client():
+    app.dependency_overrides[YouTubeService] = _FakeYouTubeService
+    yield TestClient(app)
+    app.dependency_overrides.clear()
+    _FakeYouTubeService.outcome = RESULT
+
+
+def test_non_ascii_admin_token_is_rejected_not_an_error(client):
+    response = client.post("/api/summarize", json={"url": VIDEO_URL}, headers={ADMIN_HEADER: "\xe9".encode("latin-1")})
+    assert response.status_code == 200
+    assert PROFILE_ID_HEADER not in response.headers
+
+
+@pytest.mark.parametrize("outcome", [None, RuntimeError("boom")])
+def test_profile_id_is_returned_on_errors(client, outcome):
+    _FakeYouTubeService.outcome = outcome
+    response = client.post("/api/summarize", json={"url": VIDEO_URL}, headers={ADMIN_HEADER: ADMIN_TOKEN})
+    assert response.status_code == 500
+    profile_id = response.headers[PROFILE_ID_HEADER]
+
+    report = client.get(f"/api/profiles/{profile_id}/report.json", headers={ADMIN_HEADER: ADMIN_TOKEN})
+    assert report.status_code == 200
+    assert report.json()["profile_id"] == profile_id
+
+
+def test_export_uses_the_shared_admin_header(client):
+    from database import crud
+    from database.database import ReadSessionLocal
+    with ReadSessionLocal() as db:  # Exports read from the replica
+        crud.create_summary_cache(db, "summaries_exported", {"paragraph": "p"})
+
+    assert client.get("/api/export/summaries", headers={ADMIN_HEADER: "\xe9".encode("latin-1")}).status_code == 403
+    response = client.get("/api/export/summaries", headers={ADMIN_HEADER: ADMIN_TOKEN})
+    assert response.status_code == 200
+    assert '"video_id": "exported"' in response.text
+
+
+def test_empty_fields_list_is_rejected(client):
+    response = client.post("/api/summarize", json={"url": VIDEO_URL, "fields": []})
+    assert response.status_code == 422
+
+
+def test_profiles_are_pruned_to_the_configured_count(client, monkeypatch):
+    import os
+    from core.config import settings
+    from core.profiling import profile_dir
+    monkeypatch.setattr(settings, "profile_max_count", 2)
+
+    ids = [client.post("/api/summarize", json={"url": VIDEO_URL}, headers={ADMIN_HEADER: ADMIN_TOKEN}).headers[PROFILE_ID_HEADER] for _ in range(4)]
+    kept = set(os.listdir(profile_dir()))
+    assert len(kept) == 2
+    assert ids[-1] in kept
+
+
+def test_profiling_lock_is_released_when_start_fails(client, monkeypatch):
+    from core.profiling import StackSampler
+
+    def broken_start(self):
+        raise RuntimeError("cannot start sampler")
+
+    monkeypatch.setattr(StackSampler, "start", broken_start)
+    response = client.post("/api/summarize", json={"url": VIDEO_URL}, headers={ADMIN_HEADER: ADMIN_TOKEN})
+    assert response.status_code == 500
+    monkeypatch.undo()
+
+    response = client.post("/api/summarize", json={"url": VIDEO_URL}, headers={ADMIN_HEADER: ADMIN_TOKEN})
+    assert PROFILE_ID_HEADER in response.headers  # Profiling still available
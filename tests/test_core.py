@@ -0,0 +1,344 @@
+# tldw_tube/tests/test_core.py
+import asyncio
+import os
+import random
+import time
+from aiohttp import web, ClientSession
+from aiohttp.test_utils import TestServer
+from core.proxy_pool import ProxyPool
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), os.pardir, "cache")
+
+
+def _proxy_app(name: str, delay: float) -> web.Application:
+    """A stand-in forward proxy that answers every request itself, after `delay` seconds."""
+    async def handle(request: web.Request) -> web.Response:
+        await asyncio.sleep(delay)
+        return web.Response(text=name)
+
+    app = web.Application()
+    app.router.add_route("*", "/{tail:.*}", handle)
+    return app
+
+
+def test_proxy_selection_prefers_healthy_fast_proxies():
+    pool = ProxyPool(["http://a", "http://b"], max_concurrency=4, hedge_enabled=False)
+    healthy, degraded = pool.proxies
+    degraded.success_rate = 0.3
+    degraded.latency = 3.0
+    random.seed(0)
+    picks = [pool.select().url for _ in range(1000)]
+    assert picks.count("http://a") > 950
+
+    healthy.in_flight = healthy.max_concurrency  # At its cap: weight 0
+    assert all(pool.select() is degraded for _ in range(50))
+
+
+def test_proxy_ejection_backs_off_and_recovers():
+    pool = ProxyPool(["http://a", "http://b"], eject_failures=2, eject_seconds=10, hedge_enabled=False)
+    bad, good = pool.proxies
+
+    for _ in range(2):
+        pool.record(bad, 0.1, ok=False)
+    first_backoff = bad.ejected_until - time.monotonic()
+    assert 9 < first_backoff <= 10
+    assert all(pool.select() is good for _ in range(50))
+
+    bad.ejected_until = 0.0
+    for _ in range(2):
+        pool.record(bad, 0.1, ok=False)
+    assert 19 < bad.ejected_until - time.monotonic() <= 20  # Doubled on the repeat ejection
+
+    # With everything ejected, the proxy closest to recovery is still tried
+    for _ in range(2):
+        pool.record(good, 0.1, ok=False)
+    assert pool.select() is good
+
+    pool.record(bad, 0.1, ok=True)
+    assert bad.ejections == 0 and bad.consecutive_failures == 0
+
+
+def test_hedge_delay_is_tracked_per_request_class():
+    pool = ProxyPool(["http://a", "http://b"], hedge_min_delay=0.1)
+    proxy = pool.proxies[0]
+    assert pool.hedge_delay("captions") == 0.1  # Cold start uses the floor
+
+    for _ in range(50):
+        pool.record(proxy, 1.5, True, "watch")
+        pool.record(proxy, 0.02, True, "captions")
+    assert pool.hedge_delay("watch") == 1.5
+    assert pool.hedge_delay("captions") == 0.1
+
+
+def test_hedged_request_wins_over_slow_proxy():
+    async def scenario():
+        async with TestServer(_proxy_app("slow", 2.0)) as slow, TestServer(_proxy_app("fast", 0.0)) as fast:
+            pool = ProxyPool([str(slow.make_url("")), str(fast.make_url(""))], hedge_min_delay=0.1)
+            slow_proxy, fast_proxy = pool.proxies
+            select = pool.select
+            pool.select = lambda exclude=(): slow_proxy if not exclude else select(exclude)
+
+            async with ClientSession() as session:
+                started = time.monotonic()
+                body = await pool.fetch("http://video.invalid/watch", session, request_class="watch")
+                elapsed = time.monotonic() - started
+            return body, elapsed, slow_proxy, fast_proxy
+
+    body, elapsed, slow_proxy, fast_proxy = asyncio.run(scenario())
+    assert body == "fast"
+    assert elapsed < 1.0
+    assert slow_proxy.in_flight == 0 and fast_proxy.in_flight == 0
+    assert slow_proxy.success_rate == 1.0  # Losing the race is not a failure
+
+
+def _run_extractor(monkeypatch, player_override=None, watch_override=None):
+    """Fetch metadata with the player backend against the recorded fixtures in cache/.
+
+    `player_override`/`watch_override` replace those endpoints' responses. Returns the
+    metadata dict (or the raised exception) and the paths the stub served.
+    """
+    from core.config import settings
+    from core.video_extractor import VideoExtractor
+    from loadtest.stub_youtube import FixtureStore, create_app
+
+    store = FixtureStore(FIXTURES_DIR, page_padding_kb=0)
+    served = []
+
+    @web.middleware
+    async def overrides(request, handler):
+        served.append(request.path)
+        if request.path == "/youtubei/v1/player" and player_override is not None:
+            return player_override()
+        if request.path == "/watch" and watch_override is not None:
+            return watch_override()
+        return await handler(request)
+
+    app = create_app(store)
+    app.middlewares.append(overrides)
+
+    async def scenario():
+        async with TestServer(app) as server:
+            monkeypatch.setattr(settings, "youtube_base_url", str(server.make_url("")).rstrip("/"))
+            monkeypatch.setattr(settings, "extractor_backend", "player")
+            async with ClientSession() as session:
+                try:
+                    return await VideoExtractor(cache=None)._fetch_metadata_dict(store.default_id, session)
+                except Exception as e:
+                    return e
+
+    return asyncio.run(scenario()), served, store
+
+
+def test_player_backend_reads_player_endpoint(monkeypatch):
+    metadata, served, store = _run_extractor(monkeypatch)
+    assert served == ["/youtubei/v1/player"]
+    assert metadata["title"] == store.video_info[store.default_id]["title"]
+    assert metadata["duration"] == store.video_info[store.default_id]["duration"]
+    assert "/api/timedtext?v=" in metadata["automatic_captions"]["en"][0]["url"]
+
+
+def test_player_backend_falls_back_when_not_playable(monkeypatch):
+    not_playable = lambda: web.json_response({"playabilityStatus": {"status": "LOGIN_REQUIRED"}})
+    metadata, served, store = _run_extractor(monkeypatch, player_override=not_playable)
+    assert served == ["/youtubei/v1/player", "/watch"]
+    assert metadata["title"] == store.video_info[store.default_id]["title"]
+
+
+def test_player_backend_falls_back_on_malformed_body(monkeypatch):
+    malformed = lambda: web.Response(text='{"playabilityStatus": ', content_type="application/json")
+    metadata, served, store = _run_extractor(monkeypatch, player_override=malformed)
+    assert served == ["/youtubei/v1/player", "/watch"]
+    assert metadata["id"] == store.default_id
+
+    no_metadata = lambda: web.Response(text="<html></html>", content_type="text/html")
+    error, _, _ = _run_extractor(monkeypatch, player_override=malformed, watch_override=no_metadata)
+    assert isinstance(error, ValueError)
+
+
+class _DictCache:
+    def __init__(self, rows=None):
+        self.rows = dict(rows or {})
+        self.writes = []
+
+    def get(self, key, cache_type="video"):
+        return self.rows.get(key)
+
+    def set(self, key, data, cache_type="video"):
+        self.rows[key] = data
+        self.writes.append(key)
+
+
+def test_old_format_video_rows_are_rewritten_compact():
+    import json
+    from core.video_extractor import VideoExtractor
+
+    with open(os.path.join(FIXTURES_DIR, "video_info_ZxCY6RF_ZB0.json")) as f:
+        full = json.load(f)
+    cache = _DictCache({"video_info_ZxCY6RF_ZB0": full})
+    extractor = VideoExtractor(cache=cache)
+
+    compact = asyncio.run(extractor.extract_video_info_async("https://www.youtube.com/watch?v=ZxCY6RF_ZB0", None))
+    assert compact.caption_track is not None
+    assert cache.writes == ["video_info_ZxCY6RF_ZB0"]
+    assert "subtitles" not in cache.rows["video_info_ZxCY6RF_ZB0"]
+
+    asyncio.run(extractor.extract_video_info_async("https://www.youtube.com/watch?v=ZxCY6RF_ZB0", None))
+    assert cache.writes == ["video_info_ZxCY6RF_ZB0"]  # Served compact from now on
+
+
+def test_transcript_index_matches_brute_force():
+    from core.transcript import TranscriptIndex
+
+    rng = random.Random(42)
+    for _ in range(50):
+        cues = []
+        for i in range(rng.randint(0, 60)):
+            start = round(rng.uniform(0, 300), 2)
+            cues.append((start, start + round(rng.uniform(0.01, 40), 2), f"cue {i} é"))  # Long cues overlap later ones
+        index = TranscriptIndex.from_cues(cues)
+        ordered = sorted(cues, key=lambda cue: cue[0])
+
+        for _ in range(20):
+            start = rng.uniform(-10, 320)
+            end = start + rng.uniform(0.01, 60)
+            expected = [{"start": s, "end": e, "text": t} for s, e, t in ordered if s < end and e > start]
+            assert index.segments(start, end) == expected
+
+        restored = TranscriptIndex.from_bytes(index.to_bytes())
+        assert list(restored.starts) == list(index.starts)
+        assert list(restored.max_ends) == list(index.max_ends)
+        assert restored.segments(0, float("inf")) == index.segments(0, float("inf"))
+
+
+def test_bootstrap_schema_skips_current_version_and_upgrades_on_bump(monkeypatch):
+    from core import startup
+    from database import crud, models
+    from database.database import SessionLocal
+
+    create_all_calls = []
+    create_all = models.Base.metadata.create_all
+    monkeypatch.setattr(models.Base.metadata, "create_all", lambda **kw: (create_all_calls.append(kw), create_all(**kw)))
+
+    startup.bootstrap_schema()
+    create_all_calls.clear()
+    startup.bootstrap_schema()
+    assert create_all_calls == []  # Version already current
+    with SessionLocal() as db:
+        assert crud.get_schema_version(db) == startup.SCHEMA_VERSION
+
+    create_all_calls.clear()
+    monkeypatch.setattr(startup, "SCHEMA_VERSION", startup.SCHEMA_VERSION + 1)
+    startup.bootstrap_schema()
+    assert len(create_all_calls) == 1
+    with SessionLocal() as db:
+        assert crud.get_schema_version(db) == startup.SCHEMA_VERSION
+    startup.bootstrap_schema()
+    assert len(create_all_calls) == 1
+
+
+def test_warm_worker_bootstraps_only_outside_gunicorn(monkeypatch):
+    from core import startup
+
+    calls = []
+    monkeypatch.setattr(startup, "bootstrap_schema", lambda: calls.append("bootstrap"))
+
+    async def start_and_stop():
+        await startup.warm_worker()
+        await startup.shutdown_worker()
+
+    monkeypatch.delenv(startup.FORKED_AT_ENV, raising=False)
+    asyncio.run(start_and_stop())
+    assert calls == ["bootstrap"]
+
+    monkeypatch.setenv(startup.FORKED_AT_ENV, str(time.time()))
+    asyncio.run(start_and_stop())
+    assert calls == ["bootstrap"]
+
+
+class _StubCompletions:
+    """chat.completions stand-in that answers each prompt with its step name, after a delay."""
+
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.calls = 0
+
+    async def create(self, model, messages):
+        from types import SimpleNamespace
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        content = f"answer {self.calls}"
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+
+
+class _SummaryCache:
+    """Primary rows plus a replica that never catches up, like a badly lagging read replica."""
+
+    def __init__(self):
+        self.primary = {}
+        self.replica = {}
+
+    def get(self, key, cache_type="summary", primary=False):
+        row = (self.primary if primary else self.replica).get(key)
+        return dict(row) if row is not None else None
+
+    def merge_summary(self, key, fields):
+        self.primary[key] = {**self.primary.get(key, {}), **fields}
+        return dict(self.primary[key])
+
+
+def _summarizer(delay: float = 0.0):
+    from types import SimpleNamespace
+    from core.summarizer import Summarizer
+    summarizer = Summarizer(cache=_SummaryCache())
+    completions = _StubCompletions(delay)
+    summarizer.client = SimpleNamespace(chat=SimpleNamespace(completions=completions))
+    return summarizer, completions
+
+
+def test_steps_needed_includes_dependencies():
+    from core.summarizer import SUMMARY_STEPS
+    summarizer, _ = _summarizer()
+    assert summarizer._steps_needed(None) == len(SUMMARY_STEPS)
+    assert summarizer._steps_needed(["paragraph"]) == 1
+    assert summarizer._steps_needed(["sentence", "paragraph"]) == 2
+    assert summarizer._steps_needed(["word"]) == SUMMARY_STEPS.index("wikipedia") + 1
+
+
+def test_replay_messages_rebuilds_conversation_from_partial_cache():
+    from core.summarizer import SUMMARY_STEPS
+    summarizer, _ = _summarizer()
+    cached = {
+        "paragraph": "P.",
+        "sentence": "S.",
+        "question": "Q?",
+        "word": "Yes. (Nuclear fusion)",
+        "wikipedia": "https://en.wikipedia.org/w/index.php?search=Nuclear+fusion",
+    }
+    done = summarizer._steps_done(cached)
+    assert done == SUMMARY_STEPS.index("wikipedia") + 1
+
+    messages = summarizer._replay_messages("transcript", "Title", "Description", cached, done)
+    assert messages[1] == {"role": "user", "content": "transcript"}
+    answers = [m["content"] for m in messages if m["role"] == "assistant"]
+    assert answers == ["P.", "S.", "Q?", "Yes.", "Nuclear fusion"]
+    assert len(messages) == 2 + 2 * done - 1  # The paragraph prompt opens the conversation
+
+
+def test_concurrent_request_waits_for_in_flight_steps():
+    from core.summarizer import SUMMARY_STEPS, _background_tasks
+    summarizer, completions = _summarizer(delay=0.01)
+
+    async def scenario():
+        first = await summarizer.summarize_async("transcript", "Title", "Description", "vid", fields=["paragraph"])
+        assert first.paragraph is not None and first.themes is None
+        assert completions.calls == 1 and "vid" in _background_tasks
+
+        full = await summarizer.summarize_async("transcript", "Title", "Description", "vid")
+        assert completions.calls == len(SUMMARY_STEPS)  # Waited for the background run instead of recomputing
+        assert full.themes is not None and full.word.endswith(")")
+
+        again = await summarizer.summarize_async("transcript", "Title", "Description", "vid")
+        assert completions.calls == len(SUMMARY_STEPS)  # Served from the primary despite the stale replica
+        assert again == full
+
+    asyncio.run(scenario())
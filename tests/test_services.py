@@ -0,0 +1,226 @@
+# tldw_tube/tests/test_services.py
+import pytest
+from sqlalchemy import exc
+from core.config import settings
+from database import crud
+from database.database import SessionLocal, ReadSessionLocal, _create_engine, pool_stats
+from services.cache_service import CacheService
+
+
+def _stats(role):
+    return next(stats for stats in pool_stats() if stats["role"] == role)
+
+
+def test_cache_writes_go_to_primary_and_reads_to_replica():
+    cache = CacheService()
+    cache.set("video_info_routing", {"title": "primary copy"}, cache_type="video")
+
+    with SessionLocal() as db:
+        assert crud.get_video_cache(db, "video_info_routing") == {"title": "primary copy"}
+    assert cache.get("video_info_routing", cache_type="video") is None  # Not replicated to the stand-in
+
+    with ReadSessionLocal() as db:
+        crud.create_video_cache(db, "video_info_routing", {"title": "replica copy"})
+    reads_before = _stats("replica0")["checkouts"]
+    assert cache.get("video_info_routing", cache_type="video") == {"title": "replica copy"}
+    assert _stats("replica0")["checkouts"] == reads_before + 1
+
+
+def test_pool_stats_report_checkouts_and_timeouts(monkeypatch):
+    monkeypatch.setattr(settings, "db_pool_timeout", 0.05)
+    engine = _create_engine(settings.database_url, "probe", pool_size=1, max_overflow=0, pool_recycle=1800)
+    held = engine.connect()
+    try:
+        with pytest.raises(exc.TimeoutError):
+            engine.connect()
+        stats = engine.pool.stats.snapshot(engine.pool)
+    finally:
+        held.close()
+        engine.dispose()
+
+    assert stats["role"] == "probe"
+    assert stats["checkouts"] == 1
+    assert stats["timeouts"] == 1
+    assert stats["checked_out"] == 1
+    assert stats["saturation"] == 1.0
+    assert [s["role"] for s in pool_stats()] == ["primary", "replica0"]
+
+
+def test_summary_merge_reads_primary_not_stale_replica():
+    cache = CacheService()
+    cache.set("summaries_merge", {"paragraph": "p", "themes": "t"}, cache_type="summary")
+    with ReadSessionLocal() as db:
+        crud.create_summary_cache(db, "summaries_merge", {"paragraph": "p"})  # Stale replica copy
+
+    merged = cache.merge_summary("summaries_merge", {"sentence": "s"})
+    assert merged == {"paragraph": "p", "themes": "t", "sentence": "s"}
+    with SessionLocal() as db:
+        assert crud.get_summary_cache(db, "summaries_merge") == merged
+
+    assert cache.merge_summary("summaries_new", {"paragraph": "q"}) == {"paragraph": "q"}
+
+
+def _memory_search(monkeypatch):
+    from services import search_service
+    backend = search_service.InMemorySearchBackend()
+    monkeypatch.setattr(search_service, "_backend", backend)
+    return backend
+
+
+def test_memory_search_ranks_title_matches_first(monkeypatch):
+    from services.search_service import SearchService
+    backend = _memory_search(monkeypatch)
+    backend.update("in_title", "title", "Fusion power explained")
+    backend.update("in_summary", "summary", "A video about fusion power plants and their cost")
+    backend.update("in_transcript", "transcript", "so today we talk about fusion power and then other things")
+    backend.update("unrelated", "title", "Gobi desert")
+
+    results = SearchService().search("fusion power")["results"]
+    assert [r["video_id"] for r in results] == ["in_title", "in_summary", "in_transcript"]
+
+
+def test_memory_search_reindexing_a_field_drops_old_terms(monkeypatch):
+    from services.search_service import SearchService
+    backend = _memory_search(monkeypatch)
+    backend.update("video", "title", "Old title about volcanoes")
+    backend.update("video", "summary", "Glaciers and volcanoes")
+    backend.update("video", "title", "New title about glaciers")
+
+    service = SearchService()
+    assert [r["video_id"] for r in service.search("volcanoes")["results"]] == ["video"]  # Still in the summary
+    assert service.search("old")["results"] == []
+    assert "old" not in backend.postings or "video" not in backend.postings["old"]
+
+    backend.update("video", "summary", "Glaciers only")
+    assert service.search("volcanoes")["results"] == []
+
+
+def test_search_cursor_pages_through_every_result_once(monkeypatch):
+    from services.search_service import SearchService
+    backend = _memory_search(monkeypatch)
+    for i in range(57):
+        backend.update(f"v{i:02d}", "title", "comet " + "filler " * (i % 5))  # Repeated ranks exercise the id tiebreak
+
+    service = SearchService()
+    seen, cursor, pages = [], None, 0
+    while True:
+        page = service.search("comet", limit=10, cursor=cursor)
+        seen.extend(r["video_id"] for r in page["results"])
+        pages += 1
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+    assert pages == 6
+    assert sorted(seen) == [f"v{i:02d}" for i in range(57)]
+    assert len(set(seen)) == 57
+
+
+def test_caption_cache_writes_do_not_touch_the_search_index(monkeypatch):
+    import asyncio
+    from services.search_service import SearchService, index_transcript_in_background
+    backend = _memory_search(monkeypatch)
+    CacheService().set("captions_indexing", "WEBVTT\n\n00:00:00.000 --> 00:00:01.000\nnebula", cache_type="caption")
+    assert backend.search("nebula", 10, None) == []
+
+    async def index():
+        await index_transcript_in_background("indexing", "nebula")
+
+    asyncio.run(index())
+    assert [r["video_id"] for r in SearchService().search("nebula")["results"]] == ["indexing"]
+
+
+@pytest.mark.parametrize("fresh", [True, False])
+def test_transcript_is_indexed_only_when_captions_are_downloaded(monkeypatch, fresh):
+    import asyncio
+    from types import SimpleNamespace
+    from models.summary import SummaryData
+    from models.video import CompactVideoMetadata
+    from services import youtube_service
+
+    metadata = CompactVideoMetadata(
+        id="indexed", title="T", description="D", duration=60, thumbnail_url="https://i.ytimg.com/x.jpg",
+        aspect_ratio=1.78, webpage_url="https://www.youtube.com/watch?v=indexed", caption_url="https://captions", caption_ext="vtt", caption_name="English",
+    )
+
+    async def extract(url, session):
+        return metadata
+
+    async def captions(video_id, track, session):
+        return "WEBVTT\n\n00:00:00.000 --> 00:00:01.000\nnebula\n", fresh
+
+    async def summarize(*args, **kwargs):
+        return SummaryData(paragraph="p")
+
+    indexed = []
+    monkeypatch.setattr(youtube_service, "index_transcript_in_background", lambda video_id, text: indexed.append((video_id, text)))
+    service = youtube_service.YouTubeService(db=None)
+    service.video_extractor = SimpleNamespace(extract_video_info_async=extract, fetch_captions_async=captions)
+    service.summarizer = SimpleNamespace(summarize_async=summarize)
+
+    result = asyncio.run(service.summarize_video("https://www.youtube.com/watch?v=indexed"))
+    assert result["summary"]["paragraph"] == "p"
+    assert indexed == ([("indexed", "nebula")] if fresh else [])
+
+
+@pytest.fixture(scope="module")
+def export_rows():
+    """Five summaries in 2001 on the replica (exports read replicas), ids e0..e4."""
+    from datetime import datetime
+    from database.models import SummaryCache, VideoCache
+    rows = [
+        # id, created_at, updated_at (None: never updated)
+        ("e0", datetime(2001, 1, 1), None),
+        ("e1", datetime(2001, 1, 2), datetime(2001, 3, 1)),
+        ("e2", datetime(2001, 1, 3), None),
+        ("e3", datetime(2001, 2, 1), datetime(2001, 2, 2)),
+        ("e4", datetime(2001, 2, 2), None),
+    ]
+    with ReadSessionLocal() as db:
+        for video_id, created_at, updated_at in rows:
+            db.add(SummaryCache(id=f"summaries_{video_id}", data={"paragraph": f"p, {video_id}"}, created_at=created_at, updated_at=updated_at))
+        db.add(VideoCache(id="video_info_e1", data={"title": "Title, with comma", "duration": 42}))
+        db.commit()
+    return {"created_from": datetime(2001, 1, 1), "created_to": datetime(2002, 1, 1)}
+
+
+def _exported_ids(chunks):
+    import json
+    return [json.loads(line)["video_id"] for line in "".join(chunks).splitlines()]
+
+
+def test_export_filters_on_created_and_effective_updated_time(export_rows):
+    from datetime import datetime
+    from services.export_service import export_summaries
+
+    assert _exported_ids(export_summaries(**export_rows)) == ["e0", "e1", "e2", "e3", "e4"]
+    assert _exported_ids(export_summaries(created_from=datetime(2001, 1, 2), created_to=datetime(2001, 2, 1))) == ["e1", "e2"]
+    # Never-updated rows count as updated when created
+    updated = dict(updated_from=datetime(2001, 1, 3), updated_to=datetime(2001, 2, 3))
+    assert _exported_ids(export_summaries(**updated)) == ["e2", "e3", "e4"]
+    assert _exported_ids(export_summaries(updated_from=datetime(2001, 3, 1), updated_to=datetime(2001, 3, 2))) == ["e1"]
+
+
+def test_export_resumes_after_the_last_exported_id(export_rows):
+    from services.export_service import export_summaries
+
+    first = _exported_ids(export_summaries(limit=2, **export_rows))
+    rest = _exported_ids(export_summaries(after=first[-1], **export_rows))
+    assert first == ["e0", "e1"]
+    assert rest == ["e2", "e3", "e4"]
+
+
+def test_export_csv_is_chunked_per_batch(export_rows):
+    import csv
+    import io
+    from services.export_service import EXPORT_COLUMNS, export_summaries
+
+    chunks = list(export_summaries("csv", batch_size=2, **export_rows))
+    assert len(chunks) == 3  # 5 rows in batches of 2, header in the first chunk
+    rows = list(csv.DictReader(io.StringIO("".join(chunks))))
+    assert tuple(rows[0]) == EXPORT_COLUMNS
+    assert [row["video_id"] for row in rows] == ["e0", "e1", "e2", "e3", "e4"]
+    assert rows[1]["title"] == "Title, with comma" and rows[1]["duration"] == "42"
+    assert rows[1]["paragraph"] == "p, e1" and rows[0]["themes"] == ""
+
+    empty = list(export_summaries("csv", after="e4", **export_rows))
+    assert "".join(empty).strip() == ",".join(EXPORT_COLUMNS)